@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Solves many inputs for one day, printing a JSON line for each input.
+
+Inputs can be files, directories (meaning every .txt file in them) or glob
+patterns. They're solved on a pool of worker processes, which each import
+the day once and then reuse it for every input they're given.
+
+    ./batch.py day07 inputs/day07/ > answers.jsonl
+"""
+import argparse
+import concurrent.futures
+import functools
+import glob
+import importlib
+import json
+import pathlib
+import time
+from typing import Any, Iterable, Iterator
+
+from cache import cached
+
+
+def expand_inputs(patterns: Iterable[str]) -> list[pathlib.Path]:
+    paths = []
+    for pattern in patterns:
+        path = pathlib.Path(pattern)
+        if path.is_dir():
+            paths.extend(sorted(path.glob("*.txt")))
+        elif path.exists():
+            paths.append(path)
+        else:
+            paths.extend(pathlib.Path(p) for p in sorted(glob.glob(pattern)))
+    return paths
+
+
+def solve_file(day: str, path: pathlib.Path) -> dict[str, Any]:
+    module = importlib.import_module(day)
+    start = time.perf_counter()
+    try:
+        with open(path) as f:
+            text = f.read()
+        part_1, part_2 = cached(day, "answers", text, module.solve, text)
+    except Exception as e:
+        return {"input": str(path), "error": repr(e)}
+    return {
+        "input": str(path),
+        "part_1": part_1,
+        "part_2": part_2,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def solve_many(
+    day: str, paths: list[pathlib.Path], jobs: int | None = None, chunksize: int = 1
+) -> Iterator[dict[str, Any]]:
+    """
+    Yields the result for each path in order, as soon as it (and every
+    result before it) is ready.
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(
+            functools.partial(solve_file, day), paths, chunksize=chunksize
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("day", help="e.g. day07")
+    parser.add_argument("inputs", nargs="+", help="files, directories or globs")
+    parser.add_argument("-j", "--jobs", type=int, help="number of worker processes")
+    parser.add_argument(
+        "-c", "--chunksize", type=int, default=1, help="inputs sent to a worker at once"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    paths = expand_inputs(args.inputs)
+    for result in solve_many(args.day, paths, args.jobs, args.chunksize):
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
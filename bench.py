@@ -0,0 +1,378 @@
+#!/usr/bin/env python
+"""
+Times every dayNN module.
+
+Each day's main() is run with do_part_1 and do_part_2 wrapped, so that the
+time spent in each part can be separated from the time spent reading and
+parsing the input. Days that stream their input solve both parts in one
+pass with solve_stream(), which is wrapped and timed as the 'stream' phase.
+Anything else counts as 'parse'.
+
+With --scales, each day is run against inputs from generate.py at each
+scale instead, and the report is keyed by e.g. 'day11@x10'.
+"""
+import argparse
+import contextlib
+import csv
+import functools
+import importlib
+import io
+import json
+import os
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from types import ModuleType
+from typing import Callable
+
+import generate
+import profiling
+
+PHASES = ("parse", "part_1", "part_2", "stream", "total")
+PHASE_FUNCTIONS = {
+    "part_1": "do_part_1",
+    "part_2": "do_part_2",
+    "stream": "solve_stream",
+}
+
+# phase -> stat -> value
+DayReport = dict[str, dict[str, float]]
+Report = dict[str, DayReport]
+
+
+def discover_days() -> list[str]:
+    return sorted(
+        p.stem for p in pathlib.Path(__file__).parent.glob("day[0-9][0-9].py")
+    )
+
+
+def has_input(day: str) -> bool:
+    return pathlib.Path(f"{day}.txt").exists()
+
+
+def reset_caches(module: ModuleType) -> None:
+    """
+    Clear any functools.cache'd functions (e.g. day12), otherwise every
+    run after the first would be timing cache lookups.
+    """
+    for obj in vars(module).values():
+        if hasattr(obj, "cache_clear"):
+            obj.cache_clear()
+
+
+class PhaseRecorder:
+    """
+    Records the wall time and the peak traced memory of each phase for a
+    single run of a day's main().
+
+    Peak memory is only recorded when tracemalloc is tracing.
+    """
+
+    def __init__(self):
+        self.times = {phase: 0.0 for phase in PHASES}
+        self.memory = {phase: 0 for phase in PHASES}
+
+    def _update_parse_peak(self) -> None:
+        if tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            self.memory["parse"] = max(self.memory["parse"], peak)
+            tracemalloc.reset_peak()
+
+    def wrap(self, phase: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self._update_parse_peak()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.times[phase] += time.perf_counter() - start
+                if tracemalloc.is_tracing():
+                    _, peak = tracemalloc.get_traced_memory()
+                    self.memory[phase] = max(self.memory[phase], peak)
+                    tracemalloc.reset_peak()
+
+        return wrapper
+
+    def run(self, module: ModuleType) -> None:
+        originals = {
+            name: getattr(module, name)
+            for name in PHASE_FUNCTIONS.values()
+            if hasattr(module, name)
+        }
+        for phase, name in PHASE_FUNCTIONS.items():
+            if name in originals:
+                setattr(module, name, self.wrap(phase, originals[name]))
+
+        # main() reads an optional input path from sys.argv, so don't let
+        # it see our own arguments
+        argv = sys.argv
+        sys.argv = [argv[0]]
+        try:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                module.main()
+            self.times["total"] = time.perf_counter() - start
+            self._update_parse_peak()
+        finally:
+            sys.argv = argv
+            for name, func in originals.items():
+                setattr(module, name, func)
+
+        self.times["parse"] = self.times["total"] - sum(
+            self.times[phase] for phase in PHASE_FUNCTIONS
+        )
+        self.memory["total"] = max(self.memory.values())
+
+
+def p95(values: list[float]) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=20, method="inclusive")[18]
+
+
+def bench_day(module: ModuleType, repeat: int, warmup: int) -> DayReport:
+    for _ in range(warmup):
+        reset_caches(module)
+        PhaseRecorder().run(module)
+
+    times: dict[str, list[float]] = {phase: [] for phase in PHASES}
+    for _ in range(repeat):
+        reset_caches(module)
+        recorder = PhaseRecorder()
+        recorder.run(module)
+        for phase in PHASES:
+            times[phase].append(recorder.times[phase])
+
+    # tracemalloc slows everything down a lot, so measure memory in a
+    # separate run rather than distorting the timings
+    reset_caches(module)
+    recorder = PhaseRecorder()
+    tracemalloc.start()
+    try:
+        recorder.run(module)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        phase: {
+            "min": min(times[phase]),
+            "median": statistics.median(times[phase]),
+            "p95": p95(times[phase]),
+            "peak_memory": recorder.memory[phase],
+        }
+        for phase in PHASES
+    }
+
+
+def profile_day(
+    module: ModuleType, name: str, profiler: str, directory: pathlib.Path
+) -> Counter[str]:
+    """
+    Runs the day once under the profiler, with the days' counters enabled.
+
+    Returns the counters, along with the hits and misses of any
+    functools.cache'd functions.
+    """
+    reset_caches(module)
+    profiling.counters.clear()
+    profiling.ENABLED = True
+    try:
+        with profiling.phase(name, profiler, directory):
+            PhaseRecorder().run(module)
+    finally:
+        profiling.ENABLED = False
+
+    counters = Counter(profiling.counters)
+    for func_name, obj in vars(module).items():
+        if hasattr(obj, "cache_info"):
+            info = obj.cache_info()
+            counters[f"{module.__name__}.{func_name}.hits"] += info.hits
+            counters[f"{module.__name__}.{func_name}.misses"] += info.misses
+    with open(directory / f"{name}.counters.json", "w") as f:
+        json.dump(counters, f, indent=2)
+    return counters
+
+
+def find_regressions(
+    report: Report, baseline: Report, threshold: float
+) -> list[tuple[str, str, float, float]]:
+    """
+    Returns (day, phase, baseline median, new median) for every phase whose
+    median is more than threshold (a fraction) slower than the baseline.
+    """
+    regressions = []
+    for day, phases in report.items():
+        for phase, stats in phases.items():
+            try:
+                old = baseline[day][phase]["median"]
+            except KeyError:
+                continue
+            if stats["median"] > old * (1 + threshold):
+                regressions.append((day, phase, old, stats["median"]))
+    return regressions
+
+
+def write_report(report: Report, path: pathlib.Path) -> None:
+    if path.suffix == ".csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["day", "phase", "min", "median", "p95", "peak_memory"])
+            for day, phases in report.items():
+                for phase, stats in phases.items():
+                    writer.writerow(
+                        [day, phase]
+                        + [stats[k] for k in ("min", "median", "p95", "peak_memory")]
+                    )
+    else:
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def read_report(path: pathlib.Path) -> Report:
+    if path.suffix == ".csv":
+        report: Report = {}
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                report.setdefault(row["day"], {})[row["phase"]] = {
+                    k: float(row[k]) for k in ("min", "median", "p95", "peak_memory")
+                }
+        return report
+    with open(path) as f:
+        return json.load(f)
+
+
+def print_report(report: Report) -> None:
+    print(f"{'day':12} {'phase':7} {'min':>10} {'median':>10} {'p95':>10} {'peak':>10}")
+    for day, phases in report.items():
+        for phase, stats in phases.items():
+            print(
+                f"{day:12} {phase:7} {stats['min']:10.4f} {stats['median']:10.4f} "
+                f"{stats['p95']:10.4f} {stats['peak_memory'] / 1024:8.0f}KB"
+            )
+
+
+def bench_days(days: list[str], args: argparse.Namespace, suffix: str = "") -> Report:
+    report: Report = {}
+    for day in days:
+        module = importlib.import_module(day)
+        name = f"{day}{suffix}"
+        report[name] = bench_day(module, repeat=args.repeat, warmup=args.warmup)
+        if args.profile:
+            counters = profile_day(module, name, args.profile, args.profile_dir)
+            for counter, value in sorted(counters.items()):
+                print(f"{counter}={value}")
+    return report
+
+
+def bench_scaling(days: list[str], args: argparse.Namespace) -> Report:
+    report: Report = {}
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as directory:
+            generate.write_inputs(pathlib.Path(directory), days, scale, args.seed)
+            with contextlib.chdir(directory):
+                report |= bench_days(days, args, suffix=f"@x{scale}")
+    return report
+
+
+def plot_scaling(report: Report, path: pathlib.Path) -> None:
+    """Plots the median total time of each day against the input scale"""
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        sys.exit("--plot needs matplotlib to be installed")
+
+    series: dict[str, list[tuple[int, float]]] = {}
+    for key, phases in report.items():
+        day, scale = key.split("@x")
+        series.setdefault(day, []).append((int(scale), phases["total"]["median"]))
+
+    fig, ax = plt.subplots()
+    for day, points in sorted(series.items()):
+        ax.plot(*zip(*sorted(points)), marker="o", label=day)
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("input scale")
+    ax.set_ylabel("median total time (s)")
+    ax.legend(fontsize="small")
+    fig.savefig(path)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "days", nargs="*", help="days to run, e.g. day01 (default: all with input)"
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-w", "--warmup", type=int, default=1)
+    parser.add_argument(
+        "-o", "--output", type=pathlib.Path, help="write report (.json or .csv)"
+    )
+    parser.add_argument(
+        "-b", "--baseline", type=pathlib.Path, help="compare against this report"
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="fractional slowdown of the median that counts as a regression",
+    )
+    parser.add_argument(
+        "--scales",
+        type=lambda value: [int(x) for x in value.split(",")],
+        help="time generated inputs at these scales instead, e.g. 1,10,100",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--plot", type=pathlib.Path, help="plot time against scale (needs matplotlib)"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=profiling.PROFILERS,
+        help="also profile one run of each day, and report the days' counters",
+    )
+    parser.add_argument(
+        "--profile-dir", type=pathlib.Path, default=pathlib.Path("profiles")
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    # Don't time cache hits
+    os.environ.pop("AOC_CACHE_DIR", None)
+    # Scaling runs change directory
+    args.profile_dir = args.profile_dir.resolve()
+
+    if args.scales:
+        report = bench_scaling(args.days or list(generate.GENERATORS), args)
+    else:
+        report = bench_days(
+            args.days or [day for day in discover_days() if has_input(day)], args
+        )
+
+    print_report(report)
+
+    if args.output:
+        write_report(report, args.output)
+
+    if args.plot:
+        plot_scaling(report, args.plot)
+
+    if args.baseline:
+        regressions = find_regressions(
+            report, read_report(args.baseline), args.threshold
+        )
+        for day, phase, old, new in regressions:
+            print(f"REGRESSION {day} {phase}: {old:.4f}s -> {new:.4f}s")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+On-disk cache for parsed inputs and answers.
+
+Entries are keyed by a hash of the input and of the source of the day and
+of the local modules it imports, so changing any of them means the old entry
+is never used again. Old entries are evicted least-recently-used first once
+the cache grows past its size limit.
+
+Caching is off unless the AOC_CACHE_DIR environment variable is set:
+
+    AOC_CACHE_DIR=.aoc_cache ./day22.py
+    ./cache.py clear day22
+"""
+import argparse
+import ast
+import hashlib
+import os
+import pathlib
+import pickle
+import tempfile
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+SOURCE_DIR = pathlib.Path(__file__).parent
+DEFAULT_MAX_SIZE = 500 * 1024 * 1024
+
+
+def source_files(day: str) -> list[pathlib.Path]:
+    """The day's source file and those of the local modules it imports"""
+    files = set()
+    pending = [day]
+    while pending:
+        path = SOURCE_DIR / f"{pending.pop()}.py"
+        if path in files or not path.exists():
+            continue
+        files.add(path)
+        for node in ast.walk(ast.parse(path.read_bytes())):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module)
+    return sorted(files)
+
+
+class Cache:
+    def __init__(self, directory: pathlib.Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, day: str, name: str, text: str) -> str:
+        digest = hashlib.sha256()
+        for path in source_files(day):
+            digest.update(path.read_bytes())
+        digest.update(text.encode())
+        return f"{day}-{name}-{digest.hexdigest()}"
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Returns (True, value) on a hit and (False, None) on a miss"""
+        path = self.directory / f"{key}.pickle"
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except Exception:
+            # Either missing, or can't be unpickled here, e.g. because it was
+            # pickled by day19 when it was running as __main__
+            return False, None
+        # The modification time is used to find the least recently used entries
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since it was read
+            pass
+        return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so that nothing ever reads a
+        # partially written entry
+        with tempfile.NamedTemporaryFile(dir=self.directory, delete=False) as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, self.directory / f"{key}.pickle")
+        self.evict()
+
+    def entries(self) -> list[tuple[pathlib.Path, os.stat_result]]:
+        """Cache entries and their stats, least recently used first"""
+        entries = []
+        for path in self.directory.glob("*.pickle"):
+            try:
+                entries.append((path, path.stat()))
+            except FileNotFoundError:
+                # Removed by another process, e.g. another run_all worker
+                continue
+        return sorted(entries, key=lambda entry: entry[1].st_mtime)
+
+    def evict(self) -> None:
+        entries = self.entries()
+        size = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if size <= self.max_size:
+                break
+            size -= stat.st_size
+            path.unlink(missing_ok=True)
+
+    def invalidate(self, day: str | None = None) -> None:
+        """Removes the entries for one day, or every entry"""
+        for path in self.directory.glob(f"{day or '*'}-*.pickle"):
+            path.unlink(missing_ok=True)
+
+
+def default_cache() -> Cache | None:
+    directory = os.environ.get("AOC_CACHE_DIR")
+    if not directory:
+        return None
+    max_size = int(os.environ.get("AOC_CACHE_MAX_SIZE", DEFAULT_MAX_SIZE))
+    return Cache(pathlib.Path(directory), max_size)
+
+
+def cached(day: str, name: str, text: str, func: Callable[..., T], *args) -> T:
+    """
+    Returns func(*args), using the cache if it's enabled.
+
+    The args aren't part of the key, so they must be derived from text, the
+    day's input.
+    """
+    cache = default_cache()
+    if cache is None:
+        return func(*args)
+
+    key = cache.key(day, name, text)
+    hit, value = cache.get(key)
+    if not hit:
+        value = func(*args)
+        cache.set(key, value)
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the on-disk cache")
+    parser.add_argument("command", choices=["clear", "list"])
+    parser.add_argument("days", nargs="*")
+    args = parser.parse_args()
+
+    cache = default_cache()
+    if cache is None:
+        parser.exit(1, "AOC_CACHE_DIR is not set\n")
+
+    if args.command == "clear":
+        for day in args.days or [None]:
+            cache.invalidate(day)
+    else:
+        for path, stat in cache.entries():
+            print(f"{stat.st_size:12} {path.stem}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,13 @@
 #!/usr/bin/env python
+from typing import Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from cache import cached, default_cache
+from loader import input_lines, open_input
 
 
 def extract_digits(line: str) -> int:
@@ -7,48 +16,180 @@ def extract_digits(line: str) -> int:
 
 
 def do_part_1(lines: list[str]) -> int:
-    return sum(extract_digits(line) for line in read_input())
+    return sum(extract_digits(line) for line in lines)
 
 
-numbers = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+def do_part_1_numpy(data: bytes) -> int:
+    """
+    Vectorised part 1 over the whole input at once. Works with any buffer,
+    e.g. an mmap of the input file.
 
+    Only the digits and newlines are kept, in order. A digit is then the
+    first on its line if it follows a newline, and the last if a newline
+    follows it.
+    """
+    assert np is not None
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    # Bytes below '0' wrap around to large numbers
+    chars = buffer[np.flatnonzero((buffer - ord("0") < 10) | (buffer == ord("\n")))]
+    is_digit = chars != ord("\n")
+    first = is_digit & np.concatenate(([True], ~is_digit[:-1]))
+    last = is_digit & np.concatenate((~is_digit[1:], [True]))
+    values = chars.astype(np.int64) - ord("0")
+    return int(10 * values[first].sum() + values[last].sum())
 
-def extract_digits_and_words(line):
-    first_digit = None
-    last_digit = None
-    for i, x in enumerate(line):
-        digit = None
-        if x.isdigit():
-            digit = x
-        else:
-            for j, number in enumerate(numbers, 1):
-                if line[i:].startswith(number):
-                    digit = j
-                    break
-        if digit is not None:
-            if first_digit is None:
-                first_digit = digit
-            last_digit = digit
-    return int(f"{first_digit}{last_digit}")
+
+numbers = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+# Maps each state to the next state for every possible byte
+Transitions = list[list[int]]
+# The (length, value) of the longest word ending in each state, if any
+Matches = list[tuple[int, int] | None]
+
+
+def build_automaton(words: dict[bytes, int]) -> tuple[Transitions, Matches]:
+    """
+    Builds an Aho-Corasick automaton for the words, with the failure links
+    compiled into a full transition table so that each byte is a single
+    lookup.
+    """
+    children: list[dict[int, int]] = [{}]
+    matches: Matches = [None]
+    for word, value in words.items():
+        state = 0
+        for byte in word:
+            if byte not in children[state]:
+                children[state][byte] = len(children)
+                children.append({})
+                matches.append(None)
+            state = children[state][byte]
+        matches[state] = (len(word), value)
+
+    transitions: Transitions = [[0] * 256 for _ in children]
+    failures = [0] * len(children)
+    # Breadth first, so that a state's failure state is always done first
+    queue = list(children[0].items())
+    for byte, child in queue:
+        transitions[0][byte] = child
+    for _, state in queue:
+        if matches[state] is None:
+            matches[state] = matches[failures[state]]
+        for byte in range(256):
+            if byte in children[state]:
+                child = children[state][byte]
+                failures[child] = transitions[failures[state]][byte]
+                transitions[state][byte] = child
+                queue.append((byte, child))
+            else:
+                transitions[state][byte] = transitions[failures[state]][byte]
+    return transitions, matches
+
+
+class NumberMatcher:
+    """
+    Finds the first and last number in a line, where a number is any of the
+    words in the vocabulary. The last number is found by running an
+    automaton of the reversed words backwards from the end of the line, so
+    neither search looks at more of the line than it needs to.
+    """
+
+    def __init__(self, words: dict[str, int]):
+        self.max_length = max(len(word.encode()) for word in words)
+        self.forwards = build_automaton({w.encode(): v for w, v in words.items()})
+        self.backwards = build_automaton(
+            {w.encode()[::-1]: v for w, v in words.items()}
+        )
+
+    def _scan(
+        self, automaton: tuple[Transitions, Matches], data: Iterable[int]
+    ) -> int | None:
+        """
+        Returns the value of the word that starts earliest in data.
+
+        A word that ends later can still start earlier, so keep going until
+        no word could start before the best match so far.
+        """
+        transitions, matches = automaton
+        state = 0
+        best = None
+        best_start = 0
+        for i, byte in enumerate(data):
+            state = transitions[state][byte]
+            match = matches[state]
+            if match is not None and (best is None or i - match[0] < best_start):
+                best_start = i - match[0]
+                best = match[1]
+            if best is not None and i - self.max_length >= best_start:
+                break
+        return best
+
+    def first(self, line: bytes) -> int | None:
+        return self._scan(self.forwards, line)
+
+    def last(self, line: bytes) -> int | None:
+        return self._scan(self.backwards, reversed(line))
+
+    def calibration_value(self, line: bytes) -> int:
+        first = self.first(line)
+        last = self.last(line)
+        assert first is not None and last is not None
+        return first * 10 + last
+
+
+digits = NumberMatcher({str(i): i for i in range(10)})
+digits_and_words = NumberMatcher(
+    {str(i): i for i in range(10)} | {word: i for i, word in enumerate(numbers, 1)}
+)
+
+
+def extract_digits_and_words(line: str) -> int:
+    return digits_and_words.calibration_value(line.encode())
 
 
 def do_part_2(lines: list[str]) -> int:
-    return sum(extract_digits_and_words(line) for line in read_input())
+    return sum(extract_digits_and_words(line) for line in lines)
 
 
-def main():
-    lines = read_input()
+def solve(text: str) -> tuple[int, int]:
+    lines = text.splitlines(keepends=True)
 
-    part_1 = do_part_1(lines)
-    print(f"{part_1=}")
+    if np is not None:
+        part_1 = do_part_1_numpy(text.encode())
+    else:
+        part_1 = do_part_1(lines)
 
     part_2 = do_part_2(lines)
+    return part_1, part_2
+
+
+def solve_stream(lines: Iterable[bytes | memoryview]) -> tuple[int, int]:
+    """
+    Solves both parts in a single pass over the lines, so the input never
+    needs to be held in memory.
+    """
+    part_1 = 0
+    part_2 = 0
+    for line in lines:
+        if line:
+            part_1 += digits.calibration_value(line)
+            part_2 += digits_and_words.calibration_value(line)
+    return part_1, part_2
+
+
+def main():
+    if default_cache() is None:
+        part_1, part_2 = solve_stream(input_lines("day01.txt"))
+    else:
+        # The whole input is needed to look up the cached answers
+        text = read_input()
+        part_1, part_2 = cached("day01", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day01.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day01.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
@@ -1,57 +1,186 @@
 #!/usr/bin/env python
-import math
-
-
-def do_part_1(lines: list[str]) -> int:
-    bag = {"red": 12, "green": 13, "blue": 14}
-
-    total = 0
-    for i, line in enumerate(lines, 1):
-        grabs = line.split(":")[1].split(";")
-        if all(
-            all(
-                bag[y] >= int(x)
-                for x, y in (draw.strip().split(" ") for draw in grab.split(","))
-            )
-            for grab in grabs
-        ):
-            total += i
-    return total
-
-
-def do_part_2(lines: list[str]) -> int:
-    bag = {"red": 12, "green": 13, "blue": 14}
-    total = 0
-    for i, line in enumerate(lines, 1):
-        grabs = line.split(":")[1].split(";")
-
-        grab_dicts = [
-            {
-                v: int(k)
-                for k, v in [draw.strip().split(" ") for draw in grab.split(",")]
-            }
-            for grab in grabs
+from array import array
+from typing import Iterable, Iterator, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from cache import cached, default_cache
+from loader import input_lines, open_input
+
+COLOURS = ("red", "green", "blue")
+# Colours are told apart by their first letter
+COLOUR_INDEX = {ord(colour[0]): i for i, colour in enumerate(COLOURS)}
+
+# Number of red, green and blue cubes in a bag
+Bag = tuple[int, int, int]
+
+BAG = (12, 13, 14)
+
+# Limit the (bags x games) arrays built when checking many bags at once
+MAX_BATCH_CELLS = 10_000_000
+
+# (game id, colour index, count)
+Draw = tuple[int, int, int]
+
+
+def tokenize(lines: Iterable[str | bytes | memoryview]) -> Iterator[Draw]:
+    """
+    Yields a (game id, colour index, count) triple for every draw in the
+    games, walking each line once a byte at a time.
+
+    A number followed by a colon is the game id, and a number followed by a
+    word is a count of the colour the word starts with. Everything else is
+    skipped.
+    """
+    for line in lines:
+        if isinstance(line, str):
+            line = line.encode()
+        game_id = 0
+        number = 0
+        in_number = False
+        for byte in line:
+            if 48 <= byte <= 57:
+                number = number * 10 + byte - 48
+                in_number = True
+            elif in_number:
+                if byte == 58:
+                    game_id = number
+                elif byte in COLOUR_INDEX:
+                    yield game_id, COLOUR_INDEX[byte], number
+                else:
+                    continue
+                number = 0
+                in_number = False
+
+
+def game_maximums(draws: Iterable[Draw]) -> Iterator[tuple[int, list[int]]]:
+    """
+    Yields each game id with the most cubes of each colour drawn in that
+    game, from the draws of one game after another.
+    """
+    current = None
+    maximums = [0, 0, 0]
+    for game_id, colour, count in draws:
+        if game_id != current:
+            if current is not None:
+                yield current, maximums
+            current = game_id
+            maximums = [0, 0, 0]
+        if count > maximums[colour]:
+            maximums[colour] = count
+    if current is not None:
+        yield current, maximums
+
+
+class GameIndex:
+    """
+    The game ids and the most cubes of each colour seen in each game, stored
+    as one column per colour, so that the input only has to be parsed once
+    however many bags are checked.
+    """
+
+    def __init__(self, ids: array, maximums: tuple[array, array, array]):
+        self.ids = ids
+        self.maximums = maximums
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str | bytes]) -> "GameIndex":
+        ids = array("I")
+        maximums = (array("I"), array("I"), array("I"))
+        for game_id, counts in game_maximums(tokenize(lines)):
+            ids.append(game_id)
+            for column, maximum in zip(maximums, counts):
+                column.append(maximum)
+        return cls(ids, maximums)
+
+    def possible_games(self, bag: Bag) -> list[int]:
+        """The ids of the games that could have been played with the bag"""
+        red, green, blue = bag
+        return [
+            game_id
+            for game_id, r, g, b in zip(self.ids, *self.maximums)
+            if r <= red and g <= green and b <= blue
         ]
-        minimums = {}
-        for colour in bag:
-            minimums[colour] = max(d.get(colour, 0) for d in grab_dicts)
-        total += math.prod(minimums.values())
-    return total
 
+    def sum_possible(self, bag: Bag) -> int:
+        return sum(self.possible_games(bag))
 
-def main():
-    lines = read_input()
+    def sum_possible_many(self, bags: Sequence[Bag]) -> list[int]:
+        """
+        sum_possible for each of the bags. With NumPy, every game is checked
+        against a batch of bags at once.
+        """
+        if np is None:
+            return [self.sum_possible(bag) for bag in bags]
+
+        ids = np.frombuffer(self.ids, dtype=np.uint32).astype(np.int64)
+        maximums = np.stack(
+            [np.frombuffer(column, dtype=np.uint32) for column in self.maximums]
+        )
+        bags_array = np.asarray(bags, dtype=np.int64).reshape(-1, 3)
+        batch_size = max(1, MAX_BATCH_CELLS // max(1, len(ids)))
+        sums = []
+        for start in range(0, len(bags_array), batch_size):
+            batch = bags_array[start : start + batch_size]
+            # (bags, colours, games) -> (bags, games)
+            possible = (maximums[None, :, :] <= batch[:, :, None]).all(axis=1)
+            sums.extend(int(x) for x in possible @ ids)
+        return sums
+
+    def sum_of_powers(self) -> int:
+        """The sum of the products of the fewest cubes needed for each game"""
+        return sum(r * g * b for r, g, b in zip(*self.maximums))
+
+
+def do_part_1(games: GameIndex) -> int:
+    return games.sum_possible(BAG)
+
+
+def do_part_2(games: GameIndex) -> int:
+    return games.sum_of_powers()
 
-    part_1 = do_part_1(lines)
-    print(f"{part_1=}")
 
-    part_2 = do_part_2(lines)
+def solve(text: str) -> tuple[int, int]:
+    games = GameIndex.from_lines(text.splitlines())
+
+    part_1 = do_part_1(games)
+
+    part_2 = do_part_2(games)
+    return part_1, part_2
+
+
+def solve_stream(lines: Iterable[bytes | memoryview]) -> tuple[int, int]:
+    """
+    Solves both parts in a single pass over the lines, keeping only one
+    game's counts in memory at a time.
+    """
+    red, green, blue = BAG
+    part_1 = 0
+    part_2 = 0
+    for game_id, (r, g, b) in game_maximums(tokenize(lines)):
+        if r <= red and g <= green and b <= blue:
+            part_1 += game_id
+        part_2 += r * g * b
+    return part_1, part_2
+
+
+def main():
+    if default_cache() is None:
+        part_1, part_2 = solve_stream(input_lines("day02.txt"))
+    else:
+        # The whole input is needed to look up the cached answers
+        text = read_input()
+        part_1, part_2 = cached("day02", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day02.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day02.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
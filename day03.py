@@ -1,9 +1,36 @@
 #!/usr/bin/env python
+import os
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from typing import Generator
+from typing import Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from cache import cached, default_cache
+from loader import input_lines, open_input
 
 Point = tuple[int, int]
 
+# The numbers in a row as (first column, last column, value), and the
+# columns of the row's symbols and of its gears
+Row = tuple[list[tuple[int, int, int]], list[int], list[int]]
+
+EMPTY_ROW: Row = ([], [], [])
+
+# "stream" keeps three rows in memory, "dict" indexes every number and
+# symbol, and "numpy" finds the part numbers and gears with boolean masks
+ENGINES = ("stream", "dict", "numpy")
+ENGINE = os.environ.get("AOC_DAY03_ENGINE", "stream")
+
+# An int64 holds any number of up to 18 digits
+MAX_INT64_DIGITS = 18
+
+# The 3x3 neighbourhood of a cell
+OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)]
+
 
 def build_numbers(lines: list[str]) -> dict[Point, int]:
     """
@@ -41,42 +68,149 @@ def build_symbols(lines: list[str]) -> dict[Point, str]:
     symbols = {}
     for j, line in enumerate(lines):
         for i, char in enumerate(line.strip()):
-            if char != ".":
+            if char != "." and not char.isdigit():
                 symbols[(i, j)] = char
     return symbols
 
 
-def nearby_points(starting_point: Point, number: int) -> Generator[Point, None, None]:
+def columns_between(columns: list[int], low: int, high: int) -> list[int]:
+    """The columns in the sorted list from low to high inclusive"""
+    return columns[bisect_left(columns, low) : bisect_right(columns, high)]
+
+
+class SymbolIndex:
     """
-    Yields generator of points next to all the points adjacent to the number,
-    including diagonally.
+    The columns of the symbols in each row, sorted, so that the symbols
+    next to a number can be found with a bisect per row rather than by
+    probing every point around the number.
     """
-    min_x = starting_point[0] - 1
-    max_x = starting_point[0] + len(str(number))
-    for x in range(min_x, max_x + 1):
-        yield (x, starting_point[1] - 1)
-        yield (x, starting_point[1] + 1)
-    yield (min_x, starting_point[1])
-    yield (max_x, starting_point[1])
+
+    def __init__(self, symbols: dict[Point, str]):
+        rows: dict[int, list[int]] = defaultdict(list)
+        for x, y in symbols:
+            rows[y].append(x)
+        self.rows = {y: sorted(columns) for y, columns in rows.items()}
+
+    def adjacent(self, starting_point: Point, number: int) -> list[Point]:
+        """
+        Returns the points of every symbol adjacent to the number, including
+        diagonally.
+        """
+        x, y = starting_point
+        min_x = x - 1
+        max_x = x + len(str(number))
+        return [
+            (column, row)
+            for row in (y - 1, y, y + 1)
+            if row in self.rows
+            for column in columns_between(self.rows[row], min_x, max_x)
+        ]
 
 
 def build_nearby_symbols(
     numbers: dict[Point, int], symbols: dict[Point, str]
-) -> dict[Point, Point]:
+) -> dict[Point, list[Point]]:
     """
-    Returns a dict where the keys are the starting points of the number
-    and the values are Points of adjacent symbols.
-
-    Note this approach assumes that each number is adjacent to zero or one symbol(s)
+    Returns a dict where the keys are the starting points of the numbers
+    that are adjacent to any symbols, and the values are the Points of all
+    of those symbols.
     """
+    index = SymbolIndex(symbols)
     nearby_symbols = {}
     for starting_point, number in numbers.items():
-        for point in nearby_points(starting_point, number):
-            if point in symbols:
-                nearby_symbols[starting_point] = point
+        adjacent = index.adjacent(starting_point, number)
+        if adjacent:
+            nearby_symbols[starting_point] = adjacent
     return nearby_symbols
 
 
+def build_nearby_symbols_numpy(
+    lines: list[str],
+) -> tuple[dict[Point, int], dict[Point, str], dict[Point, list[Point]]]:
+    """
+    Returns the numbers, symbols and nearby symbols in the same form as the
+    dict engine, found with masks over the whole schematic at once.
+
+    The symbol mask is dilated by a cell in every direction, and any run of
+    digits that it covers is a part number. The runs of digits around each
+    gear are found by looking up the run labels of its 3x3 neighbourhood.
+    Only the gears are returned as symbols, since the other symbols aren't
+    needed once the part numbers are known.
+    """
+    assert np is not None
+    rows = [line.strip().encode() for line in lines if line.strip()]
+    height = len(rows)
+    width = len(rows[0])
+    # Pad the grid with a border of '.', so that shifted masks never wrap
+    # and runs of digits never continue onto the next row
+    grid = np.full((height + 2, width + 2), ord("."), dtype=np.uint8)
+    grid[1:-1, 1:-1] = np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(
+        height, width
+    )
+    # Bytes below '0' wrap around to large numbers
+    is_digit = grid - ord("0") < 10
+    is_symbol = ~is_digit & (grid != ord("."))
+
+    # Label each run of digits 1, 2, 3, ... in reading order, and 0 elsewhere
+    digits = is_digit.ravel()
+    starts = digits & ~np.concatenate(([False], digits[:-1]))
+    ends = digits & ~np.concatenate((digits[1:], [False]))
+    labels = np.cumsum(starts) * digits
+    start_indexes = np.flatnonzero(starts)
+    end_indexes = np.flatnonzero(ends)
+    if len(start_indexes) and (end_indexes - start_indexes).max() >= MAX_INT64_DIGITS:
+        # Too long to sum in an int64 without overflowing, so use Python ints
+        flat = grid.ravel()
+        values = [
+            int(flat[start : end + 1].tobytes())
+            for start, end in zip(start_indexes.tolist(), end_indexes.tolist())
+        ]
+    else:
+        digit_indexes = np.flatnonzero(digits)
+        places = end_indexes[labels[digit_indexes] - 1] - digit_indexes
+        place_values = (grid.ravel()[digit_indexes] - ord("0")).astype(np.int64)
+        place_values *= 10 ** places.astype(np.int64)
+        # Runs are contiguous in digit_indexes, so each run's value is the sum
+        # of one slice
+        values = np.add.reduceat(
+            place_values, np.searchsorted(digit_indexes, start_indexes)
+        ).tolist()
+
+    dilated = np.zeros_like(is_symbol)
+    for dy, dx in OFFSETS:
+        dilated[1:-1, 1:-1] |= is_symbol[
+            1 + dy : height + 1 + dy, 1 + dx : width + 1 + dx
+        ]
+    part_labels = np.unique(labels[dilated.ravel() & digits])
+
+    gear_ys, gear_xs = np.nonzero(grid == ord("*"))
+    labels = labels.reshape(grid.shape)
+    around = np.sort(
+        np.stack([labels[gear_ys + dy, gear_xs + dx] for dy, dx in OFFSETS], axis=1),
+        axis=1,
+    )
+    # The first cell of each distinct run around each gear
+    distinct = (around > 0) & np.concatenate(
+        (np.ones((len(around), 1), dtype=bool), around[:, 1:] != around[:, :-1]),
+        axis=1,
+    )
+
+    starting_points = [
+        (x - 1, y - 1) for y, x in zip(*np.divmod(start_indexes, width + 2))
+    ]
+    numbers = dict(zip(starting_points, values))
+    symbols = {}
+    nearby_symbols: dict[Point, list[Point]] = {
+        starting_points[label - 1]: [] for label in part_labels.tolist()
+    }
+    gear_rows, gear_columns = np.nonzero(distinct)
+    for gear, label in zip(gear_rows.tolist(), around[distinct].tolist()):
+        point = (int(gear_xs[gear]) - 1, int(gear_ys[gear]) - 1)
+        symbols[point] = "*"
+        nearby_symbols[starting_points[label - 1]].append(point)
+    return numbers, symbols, nearby_symbols
+
+
 def do_part_1(numbers: dict[Point, int], nearby_symbols) -> int:
     return sum(numbers[starting_point] for starting_point in nearby_symbols)
 
@@ -86,30 +220,132 @@ def do_part_2(
 ) -> int:
     gears = defaultdict(list)
 
-    for starting_point, symbol_point in nearby_symbols.items():
-        if symbols[symbol_point] == "*":
-            gears[symbol_point].append(numbers[starting_point])
+    for starting_point, symbol_points in nearby_symbols.items():
+        for symbol_point in symbol_points:
+            if symbols[symbol_point] == "*":
+                gears[symbol_point].append(numbers[starting_point])
 
     return sum([gear[0] * gear[1] for gear in gears.values() if len(gear) == 2])
 
 
-def main():
-    lines = read_input()
+def solve(text: str, engine: str = ENGINE) -> tuple[int, int]:
+    if engine == "stream":
+        return solve_stream(line.encode() for line in text.splitlines())
+
+    lines = text.splitlines(keepends=True)
 
-    numbers = build_numbers(lines)
-    symbols = build_symbols(lines)
-    nearby_symbols = build_nearby_symbols(numbers, symbols)
+    if engine == "numpy":
+        numbers, symbols, nearby_symbols = build_nearby_symbols_numpy(lines)
+    elif engine == "dict":
+        numbers = build_numbers(lines)
+        symbols = build_symbols(lines)
+        nearby_symbols = build_nearby_symbols(numbers, symbols)
+    else:
+        raise ValueError(f"Unknown engine {engine!r}")
 
     part_1 = do_part_1(numbers, nearby_symbols)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(numbers, symbols, nearby_symbols)
+    return part_1, part_2
+
+
+def parse_row(line: bytes | memoryview) -> Row:
+    numbers = []
+    symbols = []
+    gears = []
+    start = -1
+    value = 0
+    # add '.' to the end so that we reach the end of any number in progress
+    for i, byte in enumerate(bytes(line).strip() + b"."):
+        if 48 <= byte <= 57:
+            if start < 0:
+                start = i
+                value = 0
+            value = value * 10 + byte - 48
+            continue
+        if start >= 0:
+            numbers.append((start, i - 1, value))
+            start = -1
+        if byte != 46:
+            symbols.append(i)
+            if byte == 42:
+                gears.append(i)
+    return numbers, symbols, gears
+
+
+def resolve_row(above: Row, row: Row, below: Row) -> tuple[int, int]:
+    """
+    Returns the sum of the part numbers in row, and the sum of the ratios of
+    the gears in row, given the rows either side of it.
+    """
+    window = (above, row, below)
+    part_numbers = sum(
+        value
+        for start, end, value in row[0]
+        if any(columns_between(symbols, start - 1, end + 1) for _, symbols, _ in window)
+    )
+
+    gear_ratios = 0
+    for column in row[2]:
+        adjacent = [
+            value
+            for numbers, _, _ in window
+            for start, end, value in numbers
+            if start - 1 <= column <= end + 1
+        ]
+        if len(adjacent) == 2:
+            gear_ratios += adjacent[0] * adjacent[1]
+    return part_numbers, gear_ratios
+
+
+def running_totals(lines: Iterable[bytes | memoryview]) -> Iterator[tuple[int, int]]:
+    """
+    Yields the running totals for both parts as each row is resolved.
+
+    A row can be resolved once the row below it has been read, so only
+    three rows are ever held in memory.
+    """
+    part_1 = 0
+    part_2 = 0
+    above = EMPTY_ROW
+    row = None
+    for line in lines:
+        if not line:
+            continue
+        below = parse_row(line)
+        if row is not None:
+            part_numbers, gear_ratios = resolve_row(above, row, below)
+            part_1 += part_numbers
+            part_2 += gear_ratios
+            yield part_1, part_2
+            above = row
+        row = below
+    if row is not None:
+        part_numbers, gear_ratios = resolve_row(above, row, EMPTY_ROW)
+        yield part_1 + part_numbers, part_2 + gear_ratios
+
+
+def solve_stream(lines: Iterable[bytes | memoryview]) -> tuple[int, int]:
+    totals = (0, 0)
+    for totals in running_totals(lines):
+        pass
+    return totals
+
+
+def main():
+    if ENGINE == "stream" and default_cache() is None:
+        part_1, part_2 = solve_stream(input_lines("day03.txt"))
+    else:
+        # The whole input is needed to look up the cached answers
+        text = read_input()
+        part_1, part_2 = cached("day03", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day03.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day03.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
@@ -1,43 +1,89 @@
 #!/usr/bin/env python
-import functools
+from collections import deque
+from typing import Iterable, Iterator
+
+from cache import cached, default_cache
+from loader import input_lines, open_input
+
+
+# Every number on the cards is below 100
+BITS = {str(n): 1 << n for n in range(100)}
+
+
+def number_mask(numbers: str) -> int:
+    """A bitmask with bit n set for each number n"""
+    mask = 0
+    for x in numbers.split():
+        mask |= BITS[x]
+    return mask
 
 
 def card_score(line: str) -> int:
-    return len(
-        functools.reduce(
-            lambda a, b: a & b,
-            ({int(x) for x in part.split()} for part in line.split(":")[1].split("|")),
-        )
-    )
+    winning, held = line.split(":")[1].split("|")
+    return (number_mask(winning) & number_mask(held)).bit_count()
 
 
-def do_part_1(scores: list[int]) -> int:
-    return sum(2 ** (s - 1) if s else 0 for s in scores)
+def do_part_1(scores: Iterable[int]) -> int:
+    return sum(1 << (s - 1) if s else 0 for s in scores)
 
 
-def do_part_2(scores: list[int]) -> int:
-    num_cards = {x: 1 for x in range(1, len(scores) + 1)}
-    for i, score in enumerate(scores, 1):
-        for x in range(i + 1, i + 1 + score):
-            num_cards[x] += num_cards[i]
+def card_counts(scores: Iterable[int]) -> Iterator[tuple[int, int]]:
+    """
+    Yields the score of each card and how many copies of it are won, in a
+    single pass. Only the copies won of the next few cards are kept, in a
+    ring buffer no longer than the highest score seen.
+    """
+    # won[i] is the number of copies won of the card i places ahead
+    won: deque[int] = deque()
+    for score in scores:
+        copies = 1 + (won.popleft() if won else 0)
+        if len(won) < score:
+            won.extend([0] * (score - len(won)))
+        for i in range(score):
+            won[i] += copies
+        yield score, copies
 
-    return sum(num_cards.values())
 
+def do_part_2(scores: Iterable[int]) -> int:
+    return sum(copies for _, copies in card_counts(scores))
 
-def main():
-    lines = read_input()
+
+def solve(text: str) -> tuple[int, int]:
+    lines = text.splitlines(keepends=True)
     scores = [card_score(line) for line in lines]
 
     part_1 = do_part_1(scores)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(scores)
+    return part_1, part_2
+
+
+def solve_stream(lines: Iterable[bytes | memoryview]) -> tuple[int, int]:
+    """Solves both parts in a single pass over the lines"""
+    part_1 = 0
+    part_2 = 0
+    scores = (card_score(str(line, "ascii")) for line in lines if line)
+    for score, copies in card_counts(scores):
+        if score:
+            part_1 += 1 << (score - 1)
+        part_2 += copies
+    return part_1, part_2
+
+
+def main():
+    if default_cache() is None:
+        part_1, part_2 = solve_stream(input_lines("day04.txt"))
+    else:
+        # The whole input is needed to look up the cached answers
+        text = read_input()
+        part_1, part_2 = cached("day04", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day04.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day04.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,23 @@
 #!/usr/bin/env python
+import functools
+import os
+from array import array
+from bisect import bisect_right
+from typing import Iterable, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from cache import cached
+from loader import open_input
+
+# "staged" pushes the seed ranges through each mapping in turn, which is the
+# quickest way to answer a few queries. "almanac" composes the mappings into
+# a single map first, which pays off over many queries.
+ENGINES = ("staged", "almanac")
+ENGINE = os.environ.get("AOC_DAY05_ENGINE", "staged")
 
 
 def parse_mappings(mapping_blocks):
@@ -12,49 +31,203 @@ def parse_mappings(mapping_blocks):
     return mappings
 
 
-def combine_ranges(old_range, new_range, delta):
-    out = []
+def coalesce(ranges: Iterable[range]) -> list[range]:
+    """Sorts the ranges, merging any that overlap or touch"""
+    merged: list[range] = []
+    for r in sorted((r for r in ranges if r), key=lambda r: r.start):
+        if merged and r.start <= merged[-1].stop:
+            if r.stop > merged[-1].stop:
+                merged[-1] = range(merged[-1].start, r.stop)
+        else:
+            merged.append(r)
+    return merged
 
-    overlap = range(
-        max(old_range.start, new_range.start), min(old_range.stop, new_range.stop)
+
+def map_ranges(mapping: dict[range, int], ranges: Iterable[range]) -> list[range]:
+    """
+    Applies one mapping to the ranges in a single sweep over both, sorted by
+    their starts, and returns the coalesced results.
+    """
+    rules = sorted(
+        ((source, delta) for source, delta in mapping.items() if source),
+        key=lambda rule: rule[0].start,
     )
+    out = []
+    i = 0
+    for r in coalesce(ranges):
+        # The ranges don't overlap, so no later range needs these rules
+        while i < len(rules) and rules[i][0].stop <= r.start:
+            i += 1
+        x = r.start
+        j = i
+        while x < r.stop:
+            if j == len(rules) or rules[j][0].start >= r.stop:
+                out.append(range(x, r.stop))
+                break
+            source, delta = rules[j]
+            if source.start > x:
+                out.append(range(x, source.start))
+                x = source.start
+            stop = min(source.stop, r.stop)
+            out.append(range(x + delta, stop + delta))
+            x = stop
+            j += 1
+    return coalesce(out)
 
-    before = range(old_range.start, min(overlap.start, old_range.stop))
-    after = range(max(overlap.stop, old_range.start), old_range.stop)
 
-    if overlap:
-        overlap = range(overlap.start + delta, overlap.stop + delta)
-    else:
-        overlap = None
-    leftover = set()
-    if before:
-        leftover.add(before)
-    if after:
-        leftover.add(after)
-    if overlap:
-        out.append(range(overlap.start + delta, overlap.stop + delta))
-    return overlap, leftover
-
-
-def find_lowest_location(mappings, ranges):
+def find_lowest_location(
+    mappings: list[dict[range, int]], ranges: Iterable[range]
+) -> int:
     for mapping in mappings:
-        next_round = set()
-        for key, delta in mapping.items():
-            old_ranges = list(ranges)
-            ranges = set()
-            for r in old_ranges:
-                overlap, leftover = combine_ranges(r, key, delta)
-                if overlap:
-                    next_round.add(overlap)
-                ranges |= leftover  # rename leftover_ranges???
-
-        ranges = next_round | ranges
-
+        ranges = map_ranges(mapping, ranges)
     return min(r.start for r in ranges)
 
 
-def main():
-    blocks = read_input()
+class Almanac:
+    """
+    A piecewise linear map over the non-negative integers.
+
+    Each x from starts[i] up to (but not including) starts[i + 1] maps to
+    x + deltas[i], and the last piece goes on forever. starts[0] is always
+    0, so every x falls in a piece.
+    """
+
+    __slots__ = ("starts", "deltas")
+
+    def __init__(self, starts: list[int], deltas: list[int]):
+        assert starts[0] == 0
+        self.starts = starts
+        self.deltas = deltas
+
+    @classmethod
+    def from_mapping(cls, mapping: dict[range, int]) -> "Almanac":
+        """Builds the map for one of the mappings from parse_mappings"""
+        starts = [0]
+        deltas = [0]
+        for source, delta in sorted(mapping.items(), key=lambda item: item[0].start):
+            if not source:
+                continue
+            if source.start == starts[-1]:
+                deltas[-1] = delta
+            else:
+                starts.append(source.start)
+                deltas.append(delta)
+            # Numbers after the range map to themselves, unless another range
+            # starts straight away
+            starts.append(source.stop)
+            deltas.append(0)
+        return cls(*merge_pieces(starts, deltas))
+
+    def __call__(self, x: int) -> int:
+        return x + self.deltas[bisect_right(self.starts, x) - 1]
+
+    def then(self, other: "Almanac") -> "Almanac":
+        """The map that applies this map and then other"""
+        starts = []
+        deltas = []
+        stops = self.starts[1:] + [None]
+        for start, stop, delta in zip(self.starts, stops, self.deltas):
+            # Split the image of this piece wherever it crosses a piece of other
+            i = bisect_right(other.starts, start + delta) - 1
+            starts.append(start)
+            deltas.append(delta + other.deltas[i])
+            for j in range(i + 1, len(other.starts)):
+                if stop is not None and other.starts[j] >= stop + delta:
+                    break
+                starts.append(other.starts[j] - delta)
+                deltas.append(delta + other.deltas[j])
+        return Almanac(*merge_pieces(starts, deltas))
+
+    def lowest(self, ranges: Iterable[range]) -> int:
+        """
+        The lowest value that any number in the ranges maps to.
+
+        Within a piece the map is increasing, so only the first number of
+        each piece that overlaps a range needs to be checked.
+        """
+        lowest = None
+        for r in ranges:
+            if not r:
+                continue
+            i = bisect_right(self.starts, r.start) - 1
+            x = r.start
+            while True:
+                value = x + self.deltas[i]
+                if lowest is None or value < lowest:
+                    lowest = value
+                i += 1
+                if i == len(self.starts) or self.starts[i] >= r.stop:
+                    break
+                x = self.starts[i]
+        assert lowest is not None
+        return lowest
+
+    def locations(self, seeds: Sequence[int]) -> "np.ndarray | array":
+        """
+        Maps every seed at once, e.g. from a NumPy array or an array('q').
+        Without NumPy the seeds are mapped one by one into an array('q').
+        """
+        if np is None:
+            return array("q", (self(seed) for seed in seeds))
+        seeds = np.asarray(seeds, dtype=np.int64)
+        pieces = np.searchsorted(self.starts, seeds, side="right") - 1
+        return seeds + np.asarray(self.deltas, dtype=np.int64)[pieces]
+
+    def lowest_many(
+        self, starts: Sequence[int], lengths: Sequence[int]
+    ) -> "np.ndarray | array":
+        """
+        The lowest location for each of many seed ranges, given as arrays of
+        their starts and (non-zero) lengths.
+        """
+        if np is None:
+            return array(
+                "q",
+                (
+                    self.lowest([range(start, start + length)])
+                    for start, length in zip(starts, lengths)
+                ),
+            )
+        starts = np.asarray(starts, dtype=np.int64)
+        stops = starts + np.asarray(lengths, dtype=np.int64)
+        assert (stops > starts).all()
+        piece_starts = np.asarray(self.starts, dtype=np.int64)
+        deltas = np.asarray(self.deltas, dtype=np.int64)
+        # The range starts in piece first and overlaps every piece up to last
+        first = np.searchsorted(piece_starts, starts, side="right") - 1
+        last = np.searchsorted(piece_starts, stops, side="left") - 1
+        lowest = starts + deltas[first]
+
+        # The lowest location of every other piece is at the piece's start.
+        # reduceat over the interleaved (first + 1, last + 1) bounds takes the
+        # minimum over each range's other pieces, with a sentinel at the end
+        # so that every bound is a valid index.
+        piece_lowest = np.append(piece_starts + deltas, np.iinfo(np.int64).max)
+        bounds = np.stack((first + 1, last + 1), axis=1).ravel()
+        others = np.minimum.reduceat(piece_lowest, bounds)[::2]
+        return np.where(last > first, np.minimum(lowest, others), lowest)
+
+
+def merge_pieces(starts: list[int], deltas: list[int]) -> tuple[list[int], list[int]]:
+    """Merges neighbouring pieces that have the same delta"""
+    merged_starts = [starts[0]]
+    merged_deltas = [deltas[0]]
+    for start, delta in zip(starts[1:], deltas[1:]):
+        if delta != merged_deltas[-1]:
+            merged_starts.append(start)
+            merged_deltas.append(delta)
+    return merged_starts, merged_deltas
+
+
+def compile_almanac(mappings: list[dict[range, int]]) -> Almanac:
+    """Composes the mappings from seed to location into a single map"""
+    return functools.reduce(
+        Almanac.then, (Almanac.from_mapping(mapping) for mapping in mappings)
+    )
+
+
+def solve(text: str, engine: str = ENGINE) -> tuple[int, int]:
+    blocks = text.split("\n\n")
 
     seed_numbers = [int(x) for x in blocks[0].split(":")[1].split()]
 
@@ -69,16 +242,28 @@ def main():
 
     mappings = parse_mappings(blocks[1:])
 
-    part_1 = find_lowest_location(mappings, seeds_part_1)
-    print(f"{part_1=}")
+    if engine == "staged":
+        part_1 = find_lowest_location(mappings, seeds_part_1)
+        part_2 = find_lowest_location(mappings, seeds_part_2)
+    elif engine == "almanac":
+        almanac = compile_almanac(mappings)
+        part_1 = almanac.lowest(seeds_part_1)
+        part_2 = almanac.lowest(seeds_part_2)
+    else:
+        raise ValueError(f"Unknown engine {engine!r}")
+    return part_1, part_2
+
 
-    part_2 = find_lowest_location(mappings, seeds_part_2)
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day05", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day05.txt") as f:
-        return f.read().split("\n\n")
+def read_input() -> str:
+    with open_input("day05.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
@@ -1,47 +1,77 @@
 #!/usr/bin/env python
 import math
+from typing import Iterable
 
+from cache import cached
+from loader import open_input
 
-def find_quadratic_roots(a, b, c):
-    zero_1 = (-b - math.sqrt(b**2 - 4 * a * c)) / (2 * a)
-    zero_2 = (-b + math.sqrt(b**2 - 4 * a * c)) / (2 * a)
-    return (zero_1, zero_2)
+
+Race = tuple[int, int]
+
+
+def winning_holds(time: int, record: int) -> tuple[int, int] | None:
+    """
+    The shortest and longest times to hold the button for that beat the
+    record, or None if no time does.
+
+    Holding for i beats the record when i * (time - i) > record, i.e.
+    between the roots of i^2 - time * i + record. The roots are found with
+    integer square roots, so they're exact however large the numbers are.
+    """
+    discriminant = time * time - 4 * record
+    if discriminant <= 0:
+        return None
+    shortest = max(0, (time - math.isqrt(discriminant)) // 2)
+    # The rounding above can be off by one either way
+    while shortest > 0 and (shortest - 1) * (time - shortest + 1) > record:
+        shortest -= 1
+    while shortest * (time - shortest) <= record:
+        # Both roots can fall between the same two integers
+        if shortest >= time // 2:
+            return None
+        shortest += 1
+    # Distances are symmetric about time / 2
+    return shortest, time - shortest
+
+
+def count_wins(time: int, record: int) -> int:
+    holds = winning_holds(time, record)
+    return 0 if holds is None else holds[1] - holds[0] + 1
+
+
+def count_wins_many(races: Iterable[Race]) -> list[int]:
+    return [count_wins(time, record) for time, record in races]
 
 
 def do_part_1(lines: list[str]) -> int:
-    pairs = list(zip(*([int(x) for x in line.split(":")[1].split()] for line in lines)))
-    return math.prod(
-        len([distance for i in range(time) if (distance := (time - i) * i) > record])
-        for time, record in pairs
-    )
+    races = zip(*([int(x) for x in line.split(":")[1].split()] for line in lines))
+    return math.prod(count_wins_many(races))
 
 
 def do_part_2(lines: list[str]) -> int:
-    time, distance = (int("".join(line.split(":")[1].split())) for line in lines)
-    z1, z2 = find_quadratic_roots(a=1, b=-time, c=distance)
-    if z1 == int(z1):
-        z1 += 1
-        z2 -= 1
-    else:
-        z1 = math.ceil(z1)
-        z2 = math.floor(z2)
+    time, record = (int("".join(line.split(":")[1].split())) for line in lines)
+    return count_wins(time, record)
 
-    return z2 - z1 + 1
 
-
-def main():
-    lines = read_input()
+def solve(text: str) -> tuple[int, int]:
+    lines = text.splitlines(keepends=True)
 
     part_1 = do_part_1(lines)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(lines)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day06", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day06.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day06.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
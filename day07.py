@@ -1,72 +1,136 @@
 #!/usr/bin/env python
-from collections import Counter
+import itertools
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from cache import cached
+from loader import open_input
 
 values = {k: v for v, k in enumerate("23456789TJQKA", 2)}
+# Jokers are the weakest card in part 2
+joker_values = values | {"J": 1}
+
+# Translate the cards to hex digits of their values, so int(..., 16) packs
+# the five values 4 bits apart
+hex_values = str.maketrans({k: f"{v:x}" for k, v in values.items()})
+joker_hex_values = str.maketrans({k: f"{v:x}" for k, v in joker_values.items()})
+
+# Maps the sum of the squares of the counts of each card in a hand to its
+# type, from high card (0) up to five of a kind (6). The sum is different
+# for each type, e.g. a full house is 3^2 + 2^2 = 13.
+HAND_TYPES = {5: 0, 7: 1, 9: 2, 11: 3, 13: 4, 17: 5, 25: 6}
+
+
+def hand_type(cards: str) -> int:
+    # Each card is counted once for each card it matches, so a group of n
+    # cards adds n^2
+    return HAND_TYPES[sum(map(cards.count, cards))]
+
+
+def joker_hand_type(cards: str) -> int:
+    """The best type the hand can be if jokers can be any card"""
+    rest = cards.replace("J", "")
+    if not rest:
+        return HAND_TYPES[25]
+    jokers = len(cards) - len(rest)
+    # Jokers always do best joining the largest group
+    largest = max(map(rest.count, rest))
+    squares = sum(map(rest.count, rest)) - largest**2 + (largest + jokers) ** 2
+    return HAND_TYPES[squares]
+
+
+# Maps the (type, number of jokers) of a hand to its type with jokers. Jokers
+# and five other kinds of card cover every case.
+JOKER_TYPES = {
+    (hand_type(cards), cards.count("J")): joker_hand_type(cards)
+    for cards in map("".join, itertools.combinations_with_replacement("J23456", 5))
+}
+
+
+def pack_key(type_: int, cards: str, card_hex_values: dict[int, str]) -> int:
+    """
+    Packs the hand's type and its five 4 bit card values into one int that
+    sorts the hands in order of strength.
+    """
+    return type_ << 20 | int(cards.translate(card_hex_values), 16)
 
 
 class Hand:
-    def __init__(self, cards, bid):
-        self.cards = [values[c] for c in cards]
+    __slots__ = ("cards", "bid", "key", "joker_key")
+
+    def __init__(self, cards: str, bid: str | int):
+        self.cards = cards
         self.bid = int(bid)
-        self.jokers_low = [c if c != 11 else 1 for c in self.cards]
+        type_ = hand_type(cards)
+        joker_type = JOKER_TYPES[type_, cards.count("J")]
+        self.key = pack_key(type_, cards, hex_values)
+        self.joker_key = pack_key(joker_type, cards, joker_hex_values)
 
     def __str__(self):
         return f"{self.cards} {self.bid}"
 
-    def strength(self, jokers=False):
-        counter = Counter(self.cards)
 
-        if jokers:
-            num_jacks = counter[values["J"]]
-            if 1 <= num_jacks <= 4:
-                counter.pop(values["J"])
-                counter.update({counter.most_common()[0][0]: num_jacks})
+# Keys are below 7 << 20, so a radix sort needs two passes of 12 bits
+RADIX_BITS = 12
 
-        most_common = counter.most_common()
 
-        if most_common[0][1] == 5:
-            return 100  # five of a kind
-        elif most_common[0][1] == 4:
-            return 90  # four of a kind
-        elif most_common[0][1] == 3 and most_common[1][1] == 2:
-            return 80  # full house
-        elif most_common[0][1] == 3:
-            return 70  # three of a kind
-        elif most_common[0][1] == 2 and most_common[1][1] == 2:
-            return 60  # two pair
-        elif most_common[0][1] == 2:
-            return 50  # one pair
-        return 40
+def rank_order(keys: "np.ndarray") -> "np.ndarray":
+    """
+    The indexes of the keys in sorted order, found with a least significant
+    digit first radix sort. NumPy's stable argsort is a radix sort for 16 bit
+    integers, so each pass is O(n).
+    """
+    low = (keys & ((1 << RADIX_BITS) - 1)).astype(np.uint16)
+    high = (keys >> RADIX_BITS).astype(np.uint16)
+    order = np.argsort(low, kind="stable")
+    return order[np.argsort(high[order], kind="stable")]
 
 
-def score_hands(hands: list[Hand]) -> int:
-    return sum(h.bid * i for i, h in enumerate(hands, 1))
+def score_hands(keys: list[int], bids: list[int]) -> int:
+    """The total winnings of the hands, ranked by their keys"""
+    if np is not None and keys:
+        order = rank_order(np.asarray(keys, dtype=np.int64))
+        bids = np.asarray(bids, dtype=np.int64)[order]
+        n = len(keys)
+        if int(bids.max()) * n * (n + 1) // 2 < 2**63:
+            return int(bids @ np.arange(1, n + 1, dtype=np.int64))
+        # The total could overflow an int64
+        return sum(bid * rank for rank, bid in enumerate(bids.tolist(), 1))
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return sum(bids[i] * rank for rank, i in enumerate(order, 1))
 
 
 def do_part_1(hands: list[Hand]) -> int:
-    hands.sort(key=lambda h: (h.strength(), h.cards))
-    return score_hands(hands)
+    return score_hands([h.key for h in hands], [h.bid for h in hands])
 
 
 def do_part_2(hands: list[Hand]) -> int:
-    hands.sort(key=lambda h: (h.strength(jokers=True), h.jokers_low))
-    return sum(h.bid * i for i, h in enumerate(hands, 1))
+    return score_hands([h.joker_key for h in hands], [h.bid for h in hands])
 
 
-def main():
-    lines = read_input()
+def solve(text: str) -> tuple[int, int]:
+    lines = text.splitlines(keepends=True)
     hands = [Hand(card, bid) for card, bid in (line.split() for line in lines)]
 
     part_1 = do_part_1(hands)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(hands)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day07", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day07.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day07.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
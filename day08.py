@@ -1,6 +1,10 @@
 #!/usr/bin/env python
 import math
-import itertools
+from dataclasses import dataclass
+from typing import Iterable
+
+from cache import cached
+from loader import open_input
 
 NodeChildren = dict[str, tuple[str, ...]]
 
@@ -17,64 +21,234 @@ def parse_input(input_str: str) -> tuple[NodeChildren, str]:
     return node_children, instructions
 
 
-def calc_length(
-    node_children: NodeChildren, node: str, instructions: str
-) -> tuple[int, str]:
-    instructions_cycle = itertools.cycle(instructions)
-    count = 0
-    start = node
-    while True:
-        node = (
-            node_children[node][0]
-            if next(instructions_cycle) == "L"
-            else node_children[node][1]
-        )
-        count += 1
-        if node.endswith("Z"):
-            if start.endswith("Z"):
-                assert start == node
-            break
-    return count, node
-
-
-def do_part_1(node_children, instructions) -> int:
-    count, _ = calc_length(node_children, "AAA", instructions)
-    return count
-
-
-def do_part_2(node_children, instructions) -> int:
-    node_lengths = {
-        node: calc_length(node_children, node, instructions)
-        for node in node_children
-        if node.endswith("A") or node.endswith("Z")
-    }
+class Network:
+    """
+    The network with the nodes numbered, and the left and right children of
+    each node in lists indexed by node id.
+    """
 
-    # Check that if XXA -> XXZ in x steps, then XXZ -> XXZ in x steps as well
-    for start, (length, dest) in node_lengths.items():
-        if start.endswith("A"):
-            next_length, next_dest = node_lengths[dest]
-            assert length == next_length
-            assert dest == next_dest
+    __slots__ = ("names", "ids", "left", "right", "instructions")
 
-    # The assertions above means that the minimum number of steps is the LCM of
-    # the lengths of the starting nodes
-    lengths = (v[0] for k, v in node_lengths.items() if k.endswith("A"))
-    return math.lcm(*lengths)
+    def __init__(self, node_children: NodeChildren, instructions: str):
+        self.names = list(node_children)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.left = [self.ids[children[0]] for children in node_children.values()]
+        self.right = [self.ids[children[1]] for children in node_children.values()]
+        # The children to move to for each instruction
+        self.instructions = [
+            self.left if instruction == "L" else self.right
+            for instruction in instructions
+        ]
 
+    def ending_with(self, suffix: str) -> list[int]:
+        return [i for i, name in enumerate(self.names) if name.endswith(suffix)]
 
-def main():
-    input_str = read_input()
-    node_children, instructions = parse_input(input_str)
 
-    part_1 = do_part_1(node_children, instructions)
-    print(f"{part_1=}")
+class JumpTable:
+    """
+    Answers which node a walk is on after any number of steps, in O(log N)
+    for N steps.
+
+    prefixes[i] maps each node to the node i steps later, starting from the
+    first instruction, and passes[k] maps each node to the node 2^k full
+    passes through the instructions later. N steps are N // len(instructions)
+    passes, made with one lookup per set bit, then a prefix of the rest.
+    """
+
+    __slots__ = ("prefixes", "passes")
+
+    def __init__(self, network: Network):
+        table = list(range(len(network.names)))
+        self.prefixes = [table]
+        for children in network.instructions:
+            table = [children[node] for node in table]
+            self.prefixes.append(table)
+        # The last prefix is one full pass
+        self.passes = [self.prefixes.pop()]
+
+    def _passes(self, k: int) -> list[int]:
+        while len(self.passes) <= k:
+            table = self.passes[-1]
+            self.passes.append([table[node] for node in table])
+        return self.passes[k]
+
+    def after(self, node: int, steps: int) -> int:
+        return self.after_many([node], steps)[0]
+
+    def after_many(self, nodes: Iterable[int], steps: int) -> list[int]:
+        """The nodes that walks from each of nodes are on after steps"""
+        num_passes, rest = divmod(steps, len(self.prefixes))
+        nodes = list(nodes)
+        for k in range(num_passes.bit_length()):
+            if num_passes >> k & 1:
+                table = self._passes(k)
+                nodes = [table[node] for node in nodes]
+        prefix = self.prefixes[rest]
+        return [prefix[node] for node in nodes]
+
+
+@dataclass
+class Cycle:
+    """
+    The steps at which a walk from a start node is on an end node.
+
+    The walk is periodic from step start: it is on an end node at the steps
+    in tail (all before start), and at every step + k * length for each step
+    in hits (all from start up to start + length).
+    """
+
+    start: int
+    length: int
+    tail: list[int]
+    hits: list[int]
+
+    def at_end(self, step: int) -> bool:
+        if step < self.start:
+            return step in self.tail
+        return (step - self.start) % self.length + self.start in self.hits
+
+
+def find_cycle(network: Network, node: int, ends: set[int]) -> Cycle:
+    """
+    Walks from node until a (node, instruction index) state repeats, which
+    finds where the walk becomes periodic.
+    """
+    num_instructions = len(network.instructions)
+    # Maps each state, as node * num_instructions + instruction index, to the
+    # step it was first seen at
+    seen = {}
+    end_steps = []
+    step = 0
+    state = node * num_instructions
+    while state not in seen:
+        seen[state] = step
+        if node in ends and step > 0:
+            end_steps.append(step)
+        i = step % num_instructions
+        node = network.instructions[i][node]
+        step += 1
+        state = node * num_instructions + (i + 1) % num_instructions
+    length = step - seen[state]
+    # Step 0 isn't counted, so the period starts at step 1 at the earliest
+    start = max(step - length, 1)
+    # The walk may need to go once more round the cycle to reach step start +
+    # length
+    for step in range(step, start + length):
+        if node in ends:
+            end_steps.append(step)
+        node = network.instructions[step % num_instructions][node]
+    tail = [x for x in end_steps if x < start]
+    hits = [x for x in end_steps if x >= start]
+
+    # The hits often repeat more than once per cycle, e.g. at every pass
+    # through the instructions, and fewer, shorter periods make them much
+    # cheaper to combine
+    length = shortest_period([x - start for x in hits], length)
+    return Cycle(start, length, tail, [x for x in hits if x < start + length])
 
-    part_2 = do_part_2(node_children, instructions)
+
+def shortest_period(offsets: list[int], length: int) -> int:
+    """
+    The shortest period that divides length and with which the offsets (all
+    below length) repeat.
+    """
+    offset_set = set(offsets)
+    divisors = [d for d in range(1, math.isqrt(length) + 1) if length % d == 0]
+    for period in sorted(set(divisors + [length // d for d in divisors])):
+        if all((x + period) % length in offset_set for x in offsets):
+            return period
+    return length
+
+
+def combine_congruences(a: int, m: int, b: int, n: int) -> tuple[int, int] | None:
+    """
+    Returns (c, lcm(m, n)) such that x = a (mod m) and x = b (mod n) exactly
+    when x = c (mod lcm(m, n)), or None if there is no such x. m and n don't
+    have to be coprime.
+    """
+    g = math.gcd(m, n)
+    if (b - a) % g:
+        return None
+    k = (b - a) // g * pow(m // g, -1, n // g) % (n // g)
+    lcm = m // g * n
+    return (a + m * k) % lcm, lcm
+
+
+def earliest_meeting(cycles: list[Cycle]) -> int | None:
+    """
+    The first step (after step 0) at which every walk is on an end node, or
+    None if they never all are at once.
+    """
+    # Before the latest start, a meeting must be in that walk's tail
+    latest = max(cycles, key=lambda cycle: cycle.start)
+    for step in latest.tail:
+        if all(cycle.at_end(step) for cycle in cycles):
+            return step
+
+    # After that every walk is periodic, so combine the residues of each
+    # walk's hits with the Chinese remainder theorem
+    residues = {0}
+    modulus = 1
+    for cycle in cycles:
+        combined = set()
+        for a in residues:
+            for hit in cycle.hits:
+                congruence = combine_congruences(
+                    a, modulus, hit % cycle.length, cycle.length
+                )
+                if congruence is not None:
+                    combined.add(congruence[0])
+        residues = combined
+        modulus = math.lcm(modulus, cycle.length)
+        if not residues:
+            return None
+    # The first step from latest.start with one of the residues
+    return min(
+        r + (latest.start - r + modulus - 1) // modulus * modulus
+        if r < latest.start
+        else r
+        for r in residues
+    )
+
+
+def do_part_1(network: Network) -> int:
+    node = network.ids["AAA"]
+    end = network.ids["ZZZ"]
+    num_instructions = len(network.instructions)
+    steps = 0
+    while steps == 0 or node != end:
+        node = network.instructions[steps % num_instructions][node]
+        steps += 1
+    return steps
+
+
+def do_part_2(network: Network) -> int:
+    ends = set(network.ending_with("Z"))
+    cycles = [find_cycle(network, node, ends) for node in network.ending_with("A")]
+    steps = earliest_meeting(cycles)
+    if steps is None:
+        raise ValueError("The ghosts are never all on nodes ending in Z at once")
+    return steps
+
+
+def solve(text: str) -> tuple[int, int]:
+    network = Network(*parse_input(text))
+
+    part_1 = do_part_1(network)
+
+    part_2 = do_part_2(network)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day08", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
 def read_input() -> str:
-    with open("day08.txt") as f:
+    with open_input("day08.txt") as f:
         return f.read()
 
 
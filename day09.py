@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 import itertools
 
+from cache import cached
+from loader import open_input
+
 
 def next_number(numbers: list[int]) -> int:
     diffs = [y - x for x, y in itertools.pairwise(numbers)]
@@ -19,20 +22,26 @@ def do_part_2(numbers_list: list[list[int]]) -> int:
     return sum(next_number(numbers[::-1]) for numbers in numbers_list)
 
 
-def main():
-    lines = read_input()
+def solve(text: str) -> tuple[int, int]:
+    lines = text.splitlines(keepends=True)
     numbers_list = [[int(x) for x in line.split()] for line in lines]
 
     part_1 = do_part_1(numbers_list)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(numbers_list)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day09", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day09.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day09.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
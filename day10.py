@@ -1,4 +1,8 @@
 #!/usr/bin/env python
+from cache import cached
+from loader import open_input
+
+
 def parse_grid(lines: list[str]) -> dict[tuple[int, int], str]:
     grid = {}
     for j, line in enumerate(lines):
@@ -144,21 +148,27 @@ def do_part_2(lines, grid, start):
     )
 
 
-def main():
-    lines = read_input()
+def solve(text: str) -> tuple[int, int]:
+    lines = text.splitlines(keepends=True)
     grid = parse_grid(lines)
     start = find_start(grid)
 
     part_1 = do_part_1(grid, start)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(lines, grid, start)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day10", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day10.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day10.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
@@ -2,6 +2,9 @@
 import itertools
 from typing import Iterable
 
+from cache import cached
+from loader import open_input
+
 Point = tuple[int, int]
 
 
@@ -45,8 +48,8 @@ def do_part_1(grid):
     return 10
 
 
-def main():
-    lines = read_input()
+def solve(text: str) -> tuple[int, int]:
+    lines = text.splitlines(keepends=True)
     grid = parse_grid(lines)
     empty_rows = get_empty_rows(lines)
     empty_columns = get_empty_columns(lines)
@@ -56,21 +59,25 @@ def main():
         for point_a, point_b in itertools.combinations(grid, 2)
     )
 
-    print(f"{part_1=}")
-
     part_2 = sum(
         calc_distance(
             point_a, point_b, empty_columns, empty_rows, expansion_factor=1_000_000
         )
         for point_a, point_b in itertools.combinations(grid, 2)
     )
+    return part_1, part_2
 
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day11", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day11.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day11.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
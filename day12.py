@@ -2,6 +2,9 @@
 from functools import cache
 import itertools
 
+from cache import cached
+from loader import open_input
+
 
 def count_valid_combinations(conditions: str, numbers: tuple[int, ...]) -> int:
     """
@@ -110,18 +113,24 @@ def do_part_2(lines: str) -> int:
     )
 
 
-def main():
-    lines = read_input()
+def solve(text: str) -> tuple[int, int]:
+    lines = text.splitlines(keepends=True)
     part_1 = do_part_1(lines)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(lines)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day12", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day12.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day12.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
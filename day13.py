@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 from typing import Sequence, Iterable
 
+from cache import cached
+from loader import open_input
+
 
 def num_differences(line1, line2):
     return len([1 for (x, y) in zip(line1, line2) if x != y])
@@ -40,18 +43,24 @@ def do_part_2(patterns: list[str]) -> int:
     return sum(pattern_summary(pattern, num_smudges=1) for pattern in patterns)
 
 
-def main():
-    patterns = read_input()
+def solve(text: str) -> tuple[int, int]:
+    patterns = text.split("\n\n")
     part_1 = do_part_1(patterns)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(patterns)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day13", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day13.txt") as f:
-        return f.read().split("\n\n")
+def read_input() -> str:
+    with open_input("day13.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
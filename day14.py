@@ -1,4 +1,7 @@
 #!/usr/bin/env python
+from cache import cached
+from loader import open_input
+
 
 Rows = tuple[tuple[str, ...], ...]
 Columns = tuple[tuple[str, ...], ...]
@@ -69,20 +72,26 @@ def do_part_2(rows: Rows) -> int:
     return sum(score_column(c) for c in zip(*rows))
 
 
-def main():
-    lines = read_input()
+def solve(text: str) -> tuple[int, int]:
+    lines = text.splitlines(keepends=True)
     rows = parse_lines(lines)
 
     part_1 = do_part_1(rows)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(rows)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day14", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day14.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day14.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
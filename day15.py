@@ -1,6 +1,9 @@
 #!/usr/bin/env python
 from functools import reduce
 
+from cache import cached
+from loader import open_input
+
 Box = dict[str, int]
 
 
@@ -43,20 +46,25 @@ def do_part_2(steps: list[str]) -> int:
     return sum(box_focussing_power(n, box) for n, box in enumerate(boxes))
 
 
-def main():
-    input_str = read_input()
-    steps = input_str.split(",")
+def solve(text: str) -> tuple[int, int]:
+    steps = text.strip().split(",")
 
     part_1 = do_part_1(steps)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(steps)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day15", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
 def read_input() -> str:
-    with open("day15.txt") as f:
-        return f.read().strip()
+    with open_input("day15.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
@@ -1,24 +1,16 @@
 #!/usr/bin/env python
-from collections import deque
 import itertools
 
-Direction = tuple[int, int]
-Point = tuple[int, int]
-Grid = dict[Point, str]
-
+from cache import cached
+from grid import DIRECTIONS, Grid
+from loader import open_input
+import profiling
 
-def parse_grid(lines: list[str]) -> Grid:
-    grid = {}
-    for j, line in enumerate(lines):
-        for i, x in enumerate(line.strip()):
-            grid[i, j] = x
-    return grid
+Direction = tuple[int, int]
 
 
-def next_directions(grid: Grid, point: Point, direction: Direction):
-    x, y = point
+def next_directions(val: str, direction: Direction):
     dx, dy = direction
-    val = grid[point]
     if val == ".":
         yield direction
     elif val == "-":
@@ -40,18 +32,38 @@ def next_directions(grid: Grid, point: Point, direction: Direction):
         yield (-dy, -dx)
 
 
+# Maps each cell value (as a byte) and incoming direction to the outgoing
+# directions, as indexes into DIRECTIONS
+beams = {
+    (ord(val), d): tuple(
+        DIRECTIONS.index(n) for n in next_directions(val, DIRECTIONS[d])
+    )
+    for val in ".-\\|/"
+    for d in range(4)
+}
+
+
 def num_energized_points(grid: Grid, x: int, y: int, dx: int, dy: int) -> int:
-    seen = set()
-    queue = deque([(x, y, dx, dy)])
-    while queue:
-        x, y, dx, dy = queue.popleft()
-        if (x, y, dx, dy) in seen:
+    """
+    Each cell of seen is a bitmask of the directions that beams have
+    already passed through that cell in.
+    """
+    cells = grid.cells
+    seen = bytearray(len(cells))
+    stack = [(grid.index(x, y), DIRECTIONS.index((dx, dy)))]
+    while stack:
+        index, direction = stack.pop()
+        if seen[index] & 1 << direction:
             continue
-        elif (x, y) in grid:
-            seen.add((x, y, dx, dy))
-            for dx, dy in next_directions(grid, (x, y), (dx, dy)):
-                queue.append((x + dx, y + dy, dx, dy))
-    return len({(x, y) for (x, y, *_) in seen})
+        seen[index] |= 1 << direction
+        for direction in beams[cells[index], direction]:
+            next_index = grid.move(index, direction)
+            if next_index != -1:
+                stack.append((next_index, direction))
+    if profiling.ENABLED:
+        profiling.counters["day16.beams"] += 1
+        profiling.counters["day16.states"] += sum(map(int.bit_count, seen))
+    return len(seen) - seen.count(0)
 
 
 def do_part_1(grid: Grid) -> int:
@@ -59,8 +71,8 @@ def do_part_1(grid: Grid) -> int:
 
 
 def do_part_2(grid: Grid) -> int:
-    max_x = max(x for (x, y) in grid)
-    max_y = max(y for (x, y) in grid)
+    max_x = grid.width - 1
+    max_y = grid.height - 1
     return max(
         itertools.chain(
             (num_energized_points(grid, i, 0, 0, 1) for i in range(max_x + 1)),
@@ -70,23 +82,26 @@ def do_part_2(grid: Grid) -> int:
         )
     )
 
-    return 2
 
-
-def main():
-    lines = [line.strip() for line in read_input()]
-    grid = parse_grid(lines)
+def solve(text: str) -> tuple[int, int]:
+    grid = Grid.from_lines(text.splitlines())
 
     part_1 = do_part_1(grid)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(grid)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day16", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day16.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day16.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
@@ -5,6 +5,9 @@ import math
 import operator
 from typing import Callable, Type
 
+from cache import cached
+from loader import open_input
+
 Operator = Callable[[int, int], bool]
 Condition = tuple[tuple[Operator, int], ...]
 Conditions = tuple[Condition, Condition, Condition, Condition]
@@ -155,21 +158,27 @@ def do_part_2(workflows) -> int:
     )
 
 
-def main():
-    workflows_str, parts_str = read_input()
-    workflows = parse_workflows(workflows_str)
+def solve(text: str) -> tuple[int, int]:
+    workflows_str, parts_str = text.split("\n\n")
+    workflows = cached("day19", "workflows", text, parse_workflows, workflows_str)
     parts = parse_parts(parts_str)
 
     part_1 = do_part_1(workflows, parts)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(workflows)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day19", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day19.txt") as f:
-        return f.read().split("\n\n")
+def read_input() -> str:
+    with open_input("day19.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
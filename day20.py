@@ -3,6 +3,9 @@ from collections import defaultdict, deque
 import math
 from typing import cast
 
+from cache import cached
+from loader import open_input
+
 
 def parse_lines(lines):
     destinations = {}
@@ -118,19 +121,25 @@ def do_part_2(lines) -> int:
     return math.prod(node_values)
 
 
-def main():
-    lines = read_input()
+def solve(text: str) -> tuple[int, int]:
+    lines = text.splitlines(keepends=True)
 
     part_1 = do_part_1(lines)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(lines)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day20", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day20.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day20.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,7 @@
 #!/usr/bin/env python
+from cache import cached
+from loader import open_input
+
 # x,y,z points
 Point = tuple[int, int, int]
 # maps a brick_id (int) to a list of points
@@ -120,14 +123,22 @@ def remove_brick(grid, bricks, brick_id) -> int:
     )
 
 
-def main():
-    lines = [line.strip() for line in read_input()]
-
+def settle_bricks(lines: list[str]) -> tuple[Grid, Bricks]:
+    """
+    Parse the bricks and drop them as far as they will go
+    """
     bricks = parse_bricks(lines)
     grid = create_grid(bricks)
     add_floor(grid)
 
     drop_bricks(grid, bricks)
+    return grid, bricks
+
+
+def solve(text: str) -> tuple[int, int]:
+    lines = [line.strip() for line in text.splitlines()]
+
+    grid, bricks = cached("day22", "settled", text, settle_bricks, lines)
 
     num_dropped = {
         brick_id: remove_brick(grid, bricks, brick_id) for brick_id in bricks
@@ -135,14 +146,19 @@ def main():
 
     part_1 = len([k for k, v in num_dropped.items() if not v])
     part_2 = sum(num_dropped.values())
+    return part_1, part_2
 
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day22", "answers", text, solve, text)
     print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day22.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day22.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
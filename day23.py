@@ -2,6 +2,10 @@
 from collections import deque
 from typing import Generator
 
+from cache import cached
+from loader import open_input
+import profiling
+
 Grid = dict[tuple[int, int], str]
 
 
@@ -60,6 +64,8 @@ def do_part_1(grid: Grid, start: tuple[int, int], end: tuple[int, int]) -> int:
             elif node in grid and node not in path:
                 queue.append(path + (node,))
 
+    if profiling.ENABLED:
+        profiling.counters["day23.part_1.paths"] += len(solutions)
     return max(len(solution) - 1 for solution in solutions)
 
 
@@ -98,11 +104,14 @@ def do_part_2(grid: Grid, start: tuple[int, int], end: tuple[int, int]) -> int:
             elif new_node not in path:
                 queue.append((path + (new_node,), cost + new_cost))
 
+    if profiling.ENABLED:
+        profiling.counters["day23.part_2.nodes"] += len(neighbours)
+        profiling.counters["day23.part_2.paths"] += len(solutions)
     return max(s[1] for s in solutions)
 
 
-def main():
-    lines = [line.strip() for line in read_input()]
+def solve(text: str) -> tuple[int, int]:
+    lines = [line.strip() for line in text.splitlines()]
 
     grid = parse_grid(lines)
     min_y = min(y for x, y in grid)
@@ -111,15 +120,21 @@ def main():
     end = next(iter((x, y) for (x, y), v in grid.items() if y == max_y))
 
     part_1 = do_part_1(grid, start, end)
-    print(f"{part_1=}")
 
     part_2 = do_part_2(grid, start, end)
+    return part_1, part_2
+
+
+def main():
+    text = read_input()
+    part_1, part_2 = cached("day23", "answers", text, solve, text)
+    print(f"{part_1=}")
     print(f"{part_2=}")
 
 
-def read_input() -> list[str]:
-    with open("day23.txt") as f:
-        return f.readlines()
+def read_input() -> str:
+    with open_input("day23.txt") as f:
+        return f.read()
 
 
 if __name__ == "__main__":
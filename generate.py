@@ -0,0 +1,521 @@
+#!/usr/bin/env python
+"""
+Generates synthetic puzzle inputs for scaling tests.
+
+A scale of 1 produces an input roughly the size of a real puzzle input,
+and a scale of 10 one roughly ten times bigger. For grid puzzles the scale
+applies to the area of the grid. The same seed always produces the same
+input.
+"""
+import argparse
+import math
+import pathlib
+import random
+import string
+from typing import Callable
+
+Generator = Callable[[random.Random, int], str]
+
+NUMBER_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+def side(base: int, scale: int) -> int:
+    """The side of a square grid with scale times the area of a base x base grid"""
+    return max(1, round(base * math.sqrt(scale)))
+
+
+def unique_names(
+    rng: random.Random, count: int, length: int, exclude=()
+) -> list[str]:
+    names: set[str] = set()
+    while len(names) < count:
+        name = "".join(rng.choices(string.ascii_lowercase, k=length))
+        if name not in exclude:
+            names.add(name)
+    return sorted(names)
+
+
+def generate_day01(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(1000 * scale):
+        tokens = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 6)):
+            choice = rng.random()
+            if choice < 0.3:
+                tokens.append(str(rng.randint(1, 9)))
+            elif choice < 0.6:
+                tokens.append(rng.choice(NUMBER_WORDS))
+            else:
+                tokens.append("".join(rng.choices(string.ascii_lowercase, k=3)))
+        rng.shuffle(tokens)
+        lines.append("".join(tokens))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day02(rng: random.Random, scale: int) -> str:
+    lines = []
+    for game in range(1, 100 * scale + 1):
+        grabs = []
+        for _ in range(rng.randint(1, 6)):
+            colours = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            grabs.append(", ".join(f"{rng.randint(1, 20)} {c}" for c in colours))
+        lines.append(f"Game {game}: " + "; ".join(grabs))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day03(rng: random.Random, scale: int) -> str:
+    size = side(140, scale)
+    rows = []
+    for _ in range(size):
+        row = []
+        while len(row) < size:
+            choice = rng.random()
+            if choice < 0.1:
+                # Keep numbers apart, as they are in real schematics
+                row.extend(str(rng.randint(1, 999)) + ".")
+            elif choice < 0.14:
+                row.append(rng.choice("*#+$/=%@&-"))
+            else:
+                row.append(".")
+        # Don't let a number run off the end of the row
+        row = row[:size]
+        while row and row[-1].isdigit():
+            row.pop()
+        rows.append("".join(row).ljust(size, "."))
+    return "\n".join(rows) + "\n"
+
+
+def generate_day04(rng: random.Random, scale: int) -> str:
+    num_cards = 200 * scale
+    lines = []
+    for card in range(1, num_cards + 1):
+        # Cards never win copies of cards past the end of the table
+        matches = min(rng.choice([0, 0, 0, 1, 1, 2, 3, 5, 8, 10]), num_cards - card)
+        numbers = rng.sample(range(1, 100), 35 - matches)
+        winning = numbers[:10]
+        held = rng.sample(winning, matches) + numbers[10:]
+        rng.shuffle(held)
+        lines.append(
+            f"Card {card:4}: "
+            + " ".join(f"{x:2}" for x in winning)
+            + " | "
+            + " ".join(f"{x:2}" for x in held)
+        )
+    return "\n".join(lines) + "\n"
+
+
+def generate_day05(rng: random.Random, scale: int) -> str:
+    limit = 2**32
+    seeds = []
+    for _ in range(10 * scale):
+        start = rng.randrange(limit)
+        seeds.extend([start, rng.randrange(1, limit // 20)])
+
+    names = ["seed", "soil", "fertilizer", "water", "light"]
+    names += ["temperature", "humidity", "location"]
+    blocks = ["seeds: " + " ".join(str(x) for x in seeds)]
+    for source_name, destination_name in zip(names, names[1:]):
+        breakpoints = sorted(rng.sample(range(1, limit), 30 * scale))
+        lines = [f"{source_name}-to-{destination_name} map:"]
+        for start, stop in zip([0] + breakpoints, breakpoints):
+            length = stop - start
+            destination = rng.randrange(limit - length)
+            lines.append(f"{destination} {start} {length}")
+        body = lines[1:]
+        rng.shuffle(body)
+        lines[1:] = body
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate_day06(rng: random.Random, scale: int) -> str:
+    times = [rng.randint(40, 99) for _ in range(4 * scale)]
+    # Records that can always be beaten
+    records = [rng.randint(time, time**2 // 4 - 1) for time in times]
+    return (
+        "Time:     " + " ".join(f"{x:4}" for x in times) + "\n"
+        "Distance: " + " ".join(f"{x:4}" for x in records) + "\n"
+    )
+
+
+def generate_day07(rng: random.Random, scale: int) -> str:
+    return "".join(
+        f"{''.join(rng.choices('23456789TJQKA', k=5))} {rng.randint(1, 1000)}\n"
+        for _ in range(1000 * scale)
+    )
+
+
+def generate_day08(rng: random.Random, scale: int) -> str:
+    """
+    Each ghost walks around its own loop, whatever the instructions say,
+    so that XXA -> XXZ and XXZ -> XXZ take the same number of steps.
+    """
+    instructions = "".join(rng.choices("LR", k=263))
+    loop_lengths = primes_near(110 * scale, 6)
+    names = unique_names(
+        rng, sum(loop_lengths), length=len(str(sum(loop_lengths))) + 3
+    )
+
+    nodes = []
+    for ghost, loop_length in enumerate(loop_lengths):
+        start = "AAA" if ghost == 0 else f"{ghost}GA"
+        end = "ZZZ" if ghost == 0 else f"{ghost}GZ"
+        loop = [names.pop() + "x" for _ in range(loop_length - 1)] + [end]
+        nodes.append((start, loop[0], loop[0]))
+        for node, child in zip(loop, loop[1:] + loop[:1]):
+            nodes.append((node, child, child))
+    rng.shuffle(nodes)
+
+    return (
+        instructions
+        + "\n\n"
+        + "".join(f"{node} = ({left}, {right})\n" for node, left, right in nodes)
+    )
+
+
+def generate_day09(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(200 * scale):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 6))]
+        offset = rng.randint(-10, 10)
+        lines.append(
+            " ".join(
+                str(sum(c * (x + offset) ** i for i, c in enumerate(coefficients)))
+                for x in range(21)
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def generate_day10(rng: random.Random, scale: int) -> str:
+    """
+    The loop is the boundary of a shape made of columns of cells, where
+    neighbouring columns always overlap so that the boundary never touches
+    itself. Everything outside the loop is random junk.
+    """
+    size = side(140, scale)
+    cells = size - 3
+    lo, hi = [], []
+    top, bottom = cells // 2, cells // 2
+    for _ in range(cells):
+        top = rng.randint(max(0, top - 3), min(bottom, top + 3))
+        bottom = rng.randint(
+            max(top, lo[-1] if lo else 0, bottom - 3), min(cells - 1, bottom + 3)
+        )
+        lo.append(top)
+        hi.append(bottom)
+
+    corners = [(0, lo[0])]
+    for x in range(cells):
+        corners.append((x + 1, lo[x]))
+        if x + 1 < cells:
+            corners.append((x + 1, lo[x + 1]))
+    for x in range(cells - 1, -1, -1):
+        corners.append((x + 1, hi[x] + 1))
+        corners.append((x, hi[x] + 1))
+        if x > 0:
+            corners.append((x, hi[x - 1] + 1))
+
+    loop = []
+    for (x1, y1), (x2, y2) in zip(corners, corners[1:] + corners[:1]):
+        dx = (x2 > x1) - (x2 < x1)
+        dy = (y2 > y1) - (y2 < y1)
+        while (x1, y1) != (x2, y2):
+            loop.append((x1, y1))
+            x1, y1 = x1 + dx, y1 + dy
+
+    shapes = {
+        frozenset([(1, 0), (-1, 0)]): "-",
+        frozenset([(0, 1), (0, -1)]): "|",
+        frozenset([(1, 0), (0, 1)]): "F",
+        frozenset([(-1, 0), (0, 1)]): "7",
+        frozenset([(1, 0), (0, -1)]): "L",
+        frozenset([(-1, 0), (0, -1)]): "J",
+    }
+    rows = [[rng.choice("|-LJ7F..") for _ in range(size)] for _ in range(size)]
+    for (px, py), (x, y), (nx, ny) in zip(
+        loop[-1:] + loop[:-1], loop, loop[1:] + loop[:1]
+    ):
+        rows[y + 1][x + 1] = shapes[frozenset([(px - x, py - y), (nx - x, ny - y)])]
+
+    # Start in the top left corner of the loop, with nothing connecting to
+    # it from the outside
+    x, y = loop[0]
+    rows[y + 1][x + 1] = "S"
+    rows[y + 1][x] = "."
+    rows[y][x + 1] = "."
+    return "".join("".join(row) + "\n" for row in rows)
+
+
+def generate_day11(rng: random.Random, scale: int) -> str:
+    size = side(140, scale)
+    empty_rows = set(rng.sample(range(size), size // 15))
+    empty_columns = set(rng.sample(range(size), size // 15))
+    return "".join(
+        "".join(
+            "#"
+            if j not in empty_rows and i not in empty_columns and rng.random() < 0.025
+            else "."
+            for i in range(size)
+        )
+        + "\n"
+        for j in range(size)
+    )
+
+
+def generate_day12(rng: random.Random, scale: int) -> str:
+    lines = []
+    for _ in range(1000 * scale):
+        numbers = [rng.randint(1, 6) for _ in range(rng.randint(1, 6))]
+        springs = "." * rng.randint(0, 2)
+        for number in numbers:
+            springs += "#" * number + "." * rng.randint(1, 3)
+        springs = "".join(c if rng.random() < 0.5 else "?" for c in springs)
+        lines.append(f"{springs} {','.join(str(x) for x in numbers)}")
+    return "\n".join(lines) + "\n"
+
+
+def generate_day13(rng: random.Random, scale: int) -> str:
+    """
+    Each pattern reflects perfectly across a vertical line, and across a
+    horizontal line apart from a single smudge.
+    """
+    patterns = []
+    for _ in range(100 * scale):
+        height, width = rng.randint(7, 17), rng.randint(7, 17)
+        a, b = rng.randint(1, height - 1), rng.randint(1, width - 2)
+
+        def mirror(n, line, limit):
+            return min(n, 2 * line - 1 - n) if 0 <= 2 * line - 1 - n < limit else n
+
+        cells = {}
+        rows = [
+            [
+                cells.setdefault(
+                    (mirror(j, a, height), mirror(i, b, width)), rng.choice("#.")
+                )
+                for i in range(width)
+            ]
+            for j in range(height)
+        ]
+        # The smudge goes in a column that isn't part of the vertical
+        # reflection, and a row that is part of the horizontal reflection
+        column = width - 1 if b < width / 2 else 0
+        row = rng.randint(max(0, 2 * a - height), a - 1)
+        rows[row][column] = "." if rows[row][column] == "#" else "#"
+        patterns.append("\n".join("".join(row) for row in rows))
+    return "\n\n".join(patterns) + "\n"
+
+
+def generate_day14(rng: random.Random, scale: int) -> str:
+    size = side(100, scale)
+    return "".join(
+        "".join(rng.choices("O#.", weights=[20, 10, 70], k=size)) + "\n"
+        for _ in range(size)
+    )
+
+
+def generate_day15(rng: random.Random, scale: int) -> str:
+    labels = unique_names(rng, 500, length=4)
+    return (
+        ",".join(
+            f"{label}-" if rng.random() < 0.3 else f"{label}={rng.randint(1, 9)}"
+            for label in rng.choices(labels, k=4000 * scale)
+        )
+        + "\n"
+    )
+
+
+def generate_day16(rng: random.Random, scale: int) -> str:
+    size = side(110, scale)
+    return "".join(
+        "".join(rng.choices(".|-/\\", weights=[90, 3, 3, 2, 2], k=size)) + "\n"
+        for _ in range(size)
+    )
+
+
+def generate_day19(rng: random.Random, scale: int) -> str:
+    num_workflows = 550 * scale
+    names = ["in"] + unique_names(
+        rng, num_workflows - 1, length=len(str(num_workflows)) + 2, exclude=["in"]
+    )
+    unused = names[1:]
+    rng.shuffle(unused)
+
+    workflows = []
+    queue = ["in"]
+    while queue:
+        name = queue.pop()
+        rules = []
+        for i in range(rng.randint(2, 4)):
+            if unused and rng.random() < 0.6:
+                target = unused.pop()
+                queue.append(target)
+            else:
+                target = rng.choice("AR")
+            if i == 0:
+                rules.append(target)
+            else:
+                field = rng.choice("xmas")
+                op = rng.choice("<>")
+                rules.append(f"{field}{op}{rng.randint(1, 4000)}:{target}")
+        workflows.append(f"{name}{{{','.join(rules[1:] + rules[:1])}}}")
+
+    parts = [
+        "{" + ",".join(f"{c}={rng.randint(1, 4000)}" for c in "xmas") + "}"
+        for _ in range(200 * scale)
+    ]
+    return "\n".join(workflows) + "\n\n" + "\n".join(parts) + "\n"
+
+
+def primes_near(n: int, count: int) -> list[int]:
+    primes: list[int] = []
+    while len(primes) < count:
+        if n > 1 and all(n % p for p in range(2, math.isqrt(n) + 1)):
+            primes.append(n)
+        n += 1
+    return primes
+
+
+def generate_day20(rng: random.Random, scale: int) -> str:
+    """
+    Four binary counters, one for each of the gc, sz, cm and xf conjunctions
+    that day20.do_part_2 watches. The scale controls the number of bits in
+    each counter, so part 2 takes scale times more button presses.
+    """
+    bits = 12 + round(math.log2(scale))
+    inverters = ["gc", "sz", "cm", "xf"]
+    names = unique_names(rng, 4 * (bits + 1), length=3)
+    periods = primes_near(2 ** (bits - 1) + rng.randrange(2 ** (bits - 2)), 4)
+
+    lines = []
+    first_flipflops = []
+    for inverter, period in zip(inverters, periods):
+        flipflops = [names.pop() for _ in range(bits)]
+        hub = names.pop()
+        first_flipflops.append(flipflops[0])
+        hub_destinations = [inverter, flipflops[0]]
+        for i, flipflop in enumerate(flipflops):
+            destinations = flipflops[i + 1 : i + 2]
+            if period >> i & 1:
+                destinations.append(hub)
+            elif i:
+                hub_destinations.append(flipflop)
+            lines.append(f"%{flipflop} -> {', '.join(destinations)}")
+        lines.append(f"&{hub} -> {', '.join(hub_destinations)}")
+        lines.append(f"&{inverter} -> zh")
+    lines.append("&zh -> rx")
+    lines.append(f"broadcaster -> {', '.join(first_flipflops)}")
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+
+def generate_day22(rng: random.Random, scale: int) -> str:
+    occupied: set[tuple[int, int, int]] = set()
+    lines = []
+    max_z = 300 * scale
+    while len(lines) < 1200 * scale:
+        start = [rng.randrange(10), rng.randrange(10), rng.randint(1, max_z)]
+        end = start.copy()
+        axis = rng.randrange(3)
+        end[axis] += rng.randint(0, 4)
+        if end[0] > 9 or end[1] > 9:
+            continue
+        points = {
+            (x, y, z)
+            for x in range(start[0], end[0] + 1)
+            for y in range(start[1], end[1] + 1)
+            for z in range(start[2], end[2] + 1)
+        }
+        if points & occupied:
+            continue
+        occupied |= points
+        lines.append(",".join(map(str, start)) + "~" + ",".join(map(str, end)))
+    return "\n".join(lines) + "\n"
+
+
+def generate_day23(rng: random.Random, scale: int) -> str:
+    """
+    A lattice of junctions joined by corridors. The slopes next to each
+    junction only allow the corridors to be walked right or down.
+    """
+    junctions = side(6, scale)
+    spacing = 22
+    size = (junctions + 1) * spacing + 1
+    rows = [["#"] * size for _ in range(size)]
+    positions = [spacing * (i + 1) for i in range(junctions)]
+
+    for p in positions:
+        for q in range(positions[0], positions[-1] + 1):
+            rows[p][q] = "."
+            rows[q][p] = "."
+        for q in positions:
+            if q != positions[-1]:
+                rows[p][q + 1] = ">"
+                rows[q + 1][p] = "v"
+            if q != positions[0]:
+                rows[p][q - 1] = ">"
+                rows[q - 1][p] = "v"
+
+    # Entrance and exit in the top left and bottom right corners
+    for j in range(positions[0]):
+        rows[j][positions[0]] = "."
+        rows[size - 1 - j][positions[-1]] = "."
+    rows[positions[0] - 1][positions[0]] = "v"
+    rows[positions[-1] + 1][positions[-1]] = "v"
+
+    # Wiggle the corridors a bit so they aren't all the same length
+    for p in positions:
+        for q1, q2 in zip(positions, positions[1:]):
+            if rng.random() < 0.5:
+                bend = rng.randint(q1 + 3, q2 - 5)
+                step = rng.choice([-1, 1])
+                depth = rng.randint(2, spacing // 2 - 2)
+                rows[p][bend] = rows[p][bend + 1] = "#"
+                for k in range(depth + 1):
+                    rows[p + k * step][bend - 1] = "."
+                    rows[p + k * step][bend + 2] = "."
+                for i in range(bend - 1, bend + 3):
+                    rows[p + depth * step][i] = "."
+    return "".join("".join(row) + "\n" for row in rows)
+
+
+GENERATORS: dict[str, Generator] = {
+    name.removeprefix("generate_"): func
+    for name, func in globals().items()
+    if name.startswith("generate_day")
+}
+
+
+def generate(day: str, scale: int = 1, seed: int = 0) -> str:
+    return GENERATORS[day](random.Random(f"{day}-{seed}"), scale)
+
+
+def write_inputs(
+    directory: pathlib.Path, days: list[str], scale: int = 1, seed: int = 0
+) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for day in days:
+        (directory / f"{day}.txt").write_text(generate(day, scale=scale, seed=seed))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "days", nargs="*", help="days to generate, e.g. day01 (default: all)"
+    )
+    parser.add_argument("-s", "--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "-d", "--directory", type=pathlib.Path, default=pathlib.Path(".")
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    write_inputs(args.directory, args.days or list(GENERATORS), args.scale, args.seed)
+
+
+if __name__ == "__main__":
+    main()
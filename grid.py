@@ -0,0 +1,86 @@
+"""
+A compact grid of single character cells.
+
+The cells are stored row by row in a single bytearray, and are addressed
+by an integer index (y * width + x) rather than an (x, y) tuple, so a grid
+costs one byte per cell rather than a tuple and a dict entry.
+"""
+from typing import Iterable, Iterator
+
+# right, down, left, up
+DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+class Grid:
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width: int, height: int, cells: bytearray):
+        assert len(cells) == width * height
+        self.width = width
+        self.height = height
+        self.cells = cells
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str | bytes]) -> "Grid":
+        rows = [
+            (line.encode() if isinstance(line, str) else bytes(line)).rstrip(b"\r\n")
+            for line in lines
+        ]
+        # Ignore any blank lines at the end of the input
+        rows = [row for row in rows if row]
+        width = len(rows[0]) if rows else 0
+        assert all(len(row) == width for row in rows)
+        return cls(width, len(rows), bytearray(b"".join(rows)))
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, index: int) -> int:
+        return self.cells[index]
+
+    def __str__(self) -> str:
+        return "\n".join(
+            self.cells[i : i + self.width].decode()
+            for i in range(0, len(self.cells), self.width)
+        )
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def point(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x: int, y: int, default: int | None = None) -> int | None:
+        if self.in_bounds(x, y):
+            return self.cells[y * self.width + x]
+        return default
+
+    def move(self, index: int, direction: int) -> int:
+        """
+        The index of the cell next to index in one of the DIRECTIONS,
+        or -1 if that would be off the edge of the grid.
+        """
+        if direction == 0:
+            return index + 1 if (index + 1) % self.width else -1
+        elif direction == 1:
+            index += self.width
+            return index if index < len(self.cells) else -1
+        elif direction == 2:
+            return index - 1 if index % self.width else -1
+        else:
+            return index - self.width if index >= self.width else -1
+
+    def neighbours(self, index: int) -> Iterator[int]:
+        """The indexes of the (up to four) cells next to index"""
+        for direction in range(4):
+            neighbour = self.move(index, direction)
+            if neighbour != -1:
+                yield neighbour
+
+    def find(self, value: bytes) -> int:
+        """The index of the first cell with the value, or -1"""
+        return self.cells.find(value)
@@ -0,0 +1,90 @@
+"""
+Input loading shared by all the days.
+
+Every day reads its own dayNN.txt by default, but a different path can be
+given as the first command line argument, or '-' to read from stdin:
+
+    ./day01.py /tmp/inputs/day01.txt
+    cat /tmp/inputs/day01.txt | ./day01.py -
+
+For very large inputs, mmap_lines and stream_lines yield one line at a time
+as bytes rather than reading the whole file into a list of strings. Days
+that stream their input get their lines from input_lines, which memory
+maps the file when the AOC_MMAP environment variable is set:
+
+    AOC_MMAP=1 ./day01.py /tmp/inputs/day01.txt
+"""
+import mmap
+import os
+import sys
+from typing import BinaryIO, Iterator, TextIO
+
+STDIN = "-"
+MMAP = bool(os.environ.get("AOC_MMAP"))
+
+
+def input_path(default: str) -> str:
+    """The path given on the command line, otherwise the default"""
+    return sys.argv[1] if len(sys.argv) > 1 else default
+
+
+def open_input(default: str) -> TextIO:
+    path = input_path(default)
+    if path == STDIN:
+        return open(sys.stdin.fileno(), closefd=False)
+    return open(path)
+
+
+def open_bytes(path: str) -> BinaryIO:
+    if path == STDIN:
+        return open(sys.stdin.fileno(), "rb", closefd=False)
+    return open(path, "rb")
+
+
+def mmap_lines(path: str) -> Iterator[memoryview]:
+    """
+    Memory maps the file and yields each line, without the newline, as a
+    memoryview into the map, so no line is copied.
+
+    Each view is released when the next line is read, so use bytes() to
+    keep a line for longer.
+    """
+    with open(path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            return
+    with mapped, memoryview(mapped) as view:
+        start = 0
+        end = len(mapped)
+        while start < end:
+            stop = mapped.find(b"\n", start)
+            if stop == -1:
+                stop = end
+            with view[start:stop] as line:
+                yield line
+            start = stop + 1
+
+
+def stream_lines(path: str = STDIN) -> Iterator[bytes]:
+    """
+    Yields each line, without the newline, reading the file (or stdin)
+    a buffer at a time.
+    """
+    with open_bytes(path) as f:
+        for line in f:
+            yield line.rstrip(b"\n")
+
+
+def input_lines(default: str) -> Iterator[bytes | memoryview]:
+    """
+    Yields each line of the input given on the command line, otherwise the
+    default, without the newline. The file is memory mapped if MMAP is set,
+    and otherwise (or for stdin, which can't be mapped) read a buffer at a
+    time.
+    """
+    path = input_path(default)
+    if MMAP and path != STDIN:
+        return mmap_lines(path)
+    return stream_lines(path)
@@ -0,0 +1,92 @@
+"""
+Opt-in profiling for the days.
+
+phase() profiles a block of code with cProfile (writing a .prof file for
+pstats/snakeviz) or with a sampling profiler (writing a .folded file of
+collapsed stacks for flamegraph.pl/speedscope).
+
+The days also keep a few counters of the work done in their hot loops. They
+are only updated when ENABLED is true, and are updated once per call rather
+than once per loop iteration where possible:
+
+    if profiling.ENABLED:
+        profiling.counters["day16.states"] += len(seen)
+"""
+import contextlib
+import cProfile
+import os
+import pathlib
+import sys
+import threading
+from collections import Counter
+from typing import Iterator
+
+ENABLED = bool(os.environ.get("AOC_PROFILE"))
+PROFILERS = ("cprofile", "sample")
+
+counters: Counter[str] = Counter()
+
+
+class Sampler:
+    """
+    Samples the stack of the thread that started it every interval seconds,
+    counting how many times each stack was seen.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread_id = threading.get_ident()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(
+                    f"{pathlib.Path(code.co_filename).stem}:{code.co_name}"
+                )
+                frame = frame.f_back
+            self.stacks[";".join(reversed(names))] += 1
+
+    def __enter__(self) -> "Sampler":
+        # The sampling thread can only run when the main thread gives up the
+        # GIL, which by default is only every 5ms
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval / 2))
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def write_folded(self, path: pathlib.Path) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextlib.contextmanager
+def phase(
+    name: str, profiler: str = "cprofile", directory: pathlib.Path = pathlib.Path(".")
+) -> Iterator[None]:
+    """
+    Profiles the block, writing the results to {name}.prof or {name}.folded
+    in directory.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    if profiler == "cprofile":
+        with cProfile.Profile() as profile:
+            yield
+        profile.dump_stats(directory / f"{name}.prof")
+    elif profiler == "sample":
+        with Sampler() as sampler:
+            yield
+        sampler.write_folded(directory / f"{name}.folded")
+    else:
+        raise ValueError(f"Unknown profiler {profiler!r}")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Runs every day in parallel and prints the answers in day order.
+
+Days are submitted longest-expected-first, using the median total times
+from a report written by bench.py, so that the slowest days start
+straight away rather than being left until the end.
+"""
+import argparse
+import concurrent.futures
+import importlib
+import pathlib
+import time
+
+from bench import discover_days, has_input, read_report
+from cache import cached
+
+
+def run_day(day: str) -> tuple[tuple[int, int], float]:
+    """
+    Solves a day's input in the current process.
+
+    Returns the answers and the elapsed time. The answers are cached when
+    AOC_CACHE_DIR is set.
+    """
+    module = importlib.import_module(day)
+    start = time.perf_counter()
+    with open(f"{day}.txt") as f:
+        text = f.read()
+    answers = cached(day, "answers", text, module.solve, text)
+    return answers, time.perf_counter() - start
+
+
+def schedule(days: list[str], timings: dict[str, float]) -> list[str]:
+    """
+    Orders days longest-expected-first. Days without a previous timing are
+    assumed to be slow, so they're started first.
+    """
+    return sorted(days, key=lambda day: -timings.get(day, float("inf")))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument(
+        "days", nargs="*", help="days to run, e.g. day01 (default: all with input)"
+    )
+    parser.add_argument(
+        "-t",
+        "--timings",
+        type=pathlib.Path,
+        help="bench.py report used to schedule the slowest days first",
+    )
+    parser.add_argument("-j", "--jobs", type=int, help="number of worker processes")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    days = args.days or [day for day in discover_days() if has_input(day)]
+
+    timings = {}
+    if args.timings:
+        timings = {
+            day: phases["total"]["median"]
+            for day, phases in read_report(args.timings).items()
+        }
+
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            day: executor.submit(run_day, day) for day in schedule(days, timings)
+        }
+
+        # Results are printed in day order as soon as they're available
+        for day in sorted(days):
+            (part_1, part_2), elapsed = futures[day].result()
+            print(f"{day} ({elapsed:.3f}s)")
+            print(f"{part_1=}")
+            print(f"{part_2=}")
+
+    print(f"total={time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()